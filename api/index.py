@@ -1,29 +1,68 @@
 from __future__ import annotations
 
 import base64
+import hashlib
 import json
 import os
-import re
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 import requests
-from flask import Flask, render_template_string, request, redirect, flash, abort, session, jsonify
+from flask import Flask, Response, render_template, request, redirect, flash, abort, session, jsonify
 
 ROOT = Path(__file__).resolve().parents[1]
 DATA = ROOT / "projects.json"
 TMP_DATA = Path("/tmp/projects.json")
 # Commit target is repo root projects.json
 TARGET_REMOTE_PATH = "projects.json"
+# Derived files written alongside projects.json in "tree" commit mode
+README_REMOTE_PATH = "readme.md"
+MIRROR_REMOTE_PATH = "db_products.json"
+
+# Shared root modules (sync_neon_db, generate_readme) live next to projects.json
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import form_parser  # noqa: E402
+import jobs  # noqa: E402
+import project_model  # noqa: E402
+import precompress  # noqa: E402
+import projects_cache  # noqa: E402
+import row_merge  # noqa: E402
+import stage_log  # noqa: E402
 
 PASSWORD = os.getenv("EDITOR_PASSWORD", "")
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN", "")
 GITHUB_REPO = os.getenv("GITHUB_REPO", "")  # e.g. "LungWai/LungWai"
 GITHUB_BRANCH = os.getenv("GITHUB_BRANCH", "main")
+# Conditional PUTs rejected as stale are merged with the remote copy and retried this often
+MERGE_ATTEMPTS = int(os.getenv("GITHUB_MERGE_ATTEMPTS", "5"))
+# Point at a local stand-in (benchmarks/fake_github.py) to exercise saves offline
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+# Seconds a github_status() result is served before it is revalidated
+GITHUB_STATUS_TTL = float(os.getenv("GITHUB_STATUS_TTL", "60"))
+# Paged editor: rows per page, and the row count above which paging is the default
+EDITOR_PAGE_SIZE = int(os.getenv("EDITOR_PAGE_SIZE", "50"))
+EDITOR_PAGED_THRESHOLD = int(os.getenv("EDITOR_PAGED_THRESHOLD", "500"))
+# "contents": commit projects.json only and let CI regenerate readme.md.
+# "tree": render readme.md + db_products.json here and commit all files at once.
+GITHUB_COMMIT_MODE = os.getenv("GITHUB_COMMIT_MODE", "contents").strip().lower()
+# Cache-Control for the public /api/projects responses; CDNs revalidate with the ETag
+PUBLIC_CACHE_CONTROL = os.getenv("PUBLIC_CACHE_CONTROL", "public, max-age=60, s-maxage=300, stale-while-revalidate=600")
+# /api/products/search page size: default, and the most a client may ask for
+SEARCH_PAGE_SIZE = int(os.getenv("SEARCH_PAGE_SIZE", "20"))
+SEARCH_MAX_PAGE_SIZE = int(os.getenv("SEARCH_MAX_PAGE_SIZE", "100"))
 
 app = Flask(__name__)
 app.secret_key = os.getenv("FLASK_SECRET_KEY", "dev-key")
 app.config.update(SESSION_COOKIE_SAMESITE="Lax", SESSION_COOKIE_SECURE=False)
+stage_log.install(app)
 
 TEMPLATE = """
 <!doctype html>
@@ -126,6 +165,7 @@ tr[data-details='db'] .details-panels .panel-desc{display:none}
 .toast{background:var(--panel);color:var(--text);border:1px solid var(--border);border-left:4px solid var(--accent);padding:10px 12px;border-radius:10px;box-shadow:var(--shadow);opacity:0;transform:translateY(8px);transition:.25s ease}
 .toast.show{opacity:1;transform:translateY(0)}
 
+.pager{display:flex;gap:8px;align-items:center;justify-content:flex-end;padding:10px 12px}
 @media (max-width:800px){.page-title{font-size:20px}.section-header{flex-direction:column;align-items:stretch;gap:8px}.filter{width:100%}.table thead th{top:92px}}
 </style>
 
@@ -155,6 +195,7 @@ tr[data-details='db'] .details-panels .panel-desc{display:none}
       <span class="chip {% if gh.status=='ok' %}ok{% else %}warn{% endif %}">Status: {{ gh.status }}</span>
       {% if gh.message %}<span class="chip">{{ gh.message }}</span>{% endif %}
       <button type="button" class="btn btn-ghost" onclick="location.reload()">Refresh</button>
+      <a class="btn btn-ghost" href="?paged={{ 0 if paged else 1 }}">{{ 'Full editor' if paged else 'Paged editor' }}</a>
     </div>
   </div>
 
@@ -166,13 +207,25 @@ tr[data-details='db'] .details-panels .panel-desc{display:none}
     {% endif %}
   {% endwith %}
 
-  <form id="editor-form" method="post" action="/api/editor" onsubmit="return confirm('Proceed to save & commit changes?');">
+  <form id="editor-form" method="post" action="/api/editor" onsubmit="{% if paged %}return savePaged(event);{% else %}return confirm('Proceed to save & commit changes?');{% endif %}">
+    <input type="hidden" name="base_version" value="{{ version }}">
+    <input type="hidden" name="base_sha" value="{{ base_sha }}">
     {% for key, rows in data.items() %}
       <section class="section-card" data-section="{{ key }}">
         <div class="section-header">
-          <h2 class="section-title">{{ key }}</h2>
+          <h2 class="section-title">{{ key }}{% if paged %} <span class="muted">({{ rows|length }})</span>{% endif %}</h2>
           <div class="section-tools">
+            {% if paged %}
+            <input type="text" class="filter" placeholder="Filter rows…" data-server-filter>
+            <select class="filter" data-sort>
+              <option value="">file order</option>
+              <option value="name">name ↑</option><option value="name:desc">name ↓</option>
+              <option value="visibility">visibility</option>
+              <option value="sync-with-db:desc">synced first</option>
+            </select>
+            {% else %}
             <input type="text" class="filter" placeholder="Filter rows…" data-target="tbody-{{ key }}">
+            {% endif %}
             <button type="button" class="btn secondary" onclick="addRow('{{ key }}')">Add Project</button>
             <button type="button" class="btn btn-ghost" data-collapse="tbody-{{ key }}">Toggle</button>
           </div>
@@ -191,8 +244,11 @@ tr[data-details='db'] .details-panels .panel-desc{display:none}
               </tr>
             </thead>
             <tbody id="tbody-{{ key }}">
+              {% if not paged %}
               {% for row in rows %}
-              <tr data-details="{{ 'db' if row.get('sync-with-db') else 'desc' }}">
+              {% set db = row.get('db-attribute') or {} %}
+              {% set synced = row.get('sync-with-db') %}
+              <tr data-details="{{ 'db' if synced else 'desc' }}">
                 <td><input name="{{ key }}[{{ loop.index0 }}][name]" value="{{ row.get('name','') }}" required></td>
                 <td><input name="{{ key }}[{{ loop.index0 }}][repo]" value="{{ row.get('repo','') }}"></td>
                 <td>
@@ -212,11 +268,11 @@ tr[data-details='db'] .details-panels .panel-desc{display:none}
                 <td>
                   <div class="details-switch segmented">
                     <label class="seg-item">
-                      <input type="radio" name="details-{{ key }}-{{ loop.index0 }}" value="desc" {% if not row.get('sync-with-db') %}checked{% endif %}>
+                      <input type="radio" name="details-{{ key }}-{{ loop.index0 }}" value="desc" {% if not synced %}checked{% endif %}>
                       <span>desc</span>
                     </label>
                     <label class="seg-item">
-                      <input type="radio" name="details-{{ key }}-{{ loop.index0 }}" value="db" {% if row.get('sync-with-db') %}checked{% endif %} data-details-radio>
+                      <input type="radio" name="details-{{ key }}-{{ loop.index0 }}" value="db" {% if synced %}checked{% endif %} data-details-radio>
                       <span>db</span>
                     </label>
                   </div>
@@ -226,24 +282,32 @@ tr[data-details='db'] .details-panels .panel-desc{display:none}
                     </div>
                     <div class="panel-db">
                       <div class="db-attrs">
-                        <input type="text" placeholder="id" name="{{ key }}[{{ loop.index0 }}][db-attribute][id]" value="{{ (row.get('db-attribute') or {}).get('id','') }}" data-db-field {% if not row.get('sync-with-db') %}disabled{% endif %}>
-                        <input type="text" placeholder="title" name="{{ key }}[{{ loop.index0 }}][db-attribute][title]" value="{{ (row.get('db-attribute') or {}).get('title','') }}" data-db-field {% if not row.get('sync-with-db') %}disabled{% endif %}>
-                        <input type="text" placeholder="year" name="{{ key }}[{{ loop.index0 }}][db-attribute][year]" value="{{ (row.get('db-attribute') or {}).get('year','') }}" data-db-field {% if not row.get('sync-with-db') %}disabled{% endif %}>
-                        <input type="text" placeholder="image" name="{{ key }}[{{ loop.index0 }}][db-attribute][image]" value="{{ (row.get('db-attribute') or {}).get('image','') }}" data-db-field {% if not row.get('sync-with-db') %}disabled{% endif %}>
-                        <input type="text" placeholder="preview_image" name="{{ key }}[{{ loop.index0 }}][db-attribute][preview_image]" value="{{ (row.get('db-attribute') or {}).get('preview_image','') }}" data-db-field {% if not row.get('sync-with-db') %}disabled{% endif %}>
-                        <input type="text" placeholder="url" name="{{ key }}[{{ loop.index0 }}][db-attribute][url]" value="{{ (row.get('db-attribute') or {}).get('url','') }}" data-db-field {% if not row.get('sync-with-db') %}disabled{% endif %}>
-                        <input type="text" placeholder="category" name="{{ key }}[{{ loop.index0 }}][db-attribute][category]" value="{{ (row.get('db-attribute') or {}).get('category','') }}" data-db-field {% if not row.get('sync-with-db') %}disabled{% endif %}>
-                        <textarea placeholder="description" name="{{ key }}[{{ loop.index0 }}][db-attribute][description]" data-db-field {% if not row.get('sync-with-db') %}disabled{% endif %}>{{ (row.get('db-attribute') or {}).get('description','') }}</textarea>
+                        <input type="text" placeholder="id" name="{{ key }}[{{ loop.index0 }}][db-attribute][id]" value="{{ db.get('id','') }}" data-db-field {% if not synced %}disabled{% endif %}>
+                        <input type="text" placeholder="title" name="{{ key }}[{{ loop.index0 }}][db-attribute][title]" value="{{ db.get('title','') }}" data-db-field {% if not synced %}disabled{% endif %}>
+                        <input type="text" placeholder="year" name="{{ key }}[{{ loop.index0 }}][db-attribute][year]" value="{{ db.get('year','') }}" data-db-field {% if not synced %}disabled{% endif %}>
+                        <input type="text" placeholder="image" name="{{ key }}[{{ loop.index0 }}][db-attribute][image]" value="{{ db.get('image','') }}" data-db-field {% if not synced %}disabled{% endif %}>
+                        <input type="text" placeholder="preview_image" name="{{ key }}[{{ loop.index0 }}][db-attribute][preview_image]" value="{{ db.get('preview_image','') }}" data-db-field {% if not synced %}disabled{% endif %}>
+                        <input type="text" placeholder="url" name="{{ key }}[{{ loop.index0 }}][db-attribute][url]" value="{{ db.get('url','') }}" data-db-field {% if not synced %}disabled{% endif %}>
+                        <input type="text" placeholder="category" name="{{ key }}[{{ loop.index0 }}][db-attribute][category]" value="{{ db.get('category','') }}" data-db-field {% if not synced %}disabled{% endif %}>
+                        <textarea placeholder="description" name="{{ key }}[{{ loop.index0 }}][db-attribute][description]" data-db-field {% if not synced %}disabled{% endif %}>{{ db.get('description','') }}</textarea>
                       </div>
                     </div>
                   </div>
                 </td>
-                <td style="text-align:center;"><input class="checkbox-compact" type="checkbox" name="{{ key }}[{{ loop.index0 }}][sync-with-db]" {% if row.get('sync-with-db') %}checked{% endif %} data-sync></td>
+                <td style="text-align:center;"><input class="checkbox-compact" type="checkbox" name="{{ key }}[{{ loop.index0 }}][sync-with-db]" {% if synced %}checked{% endif %} data-sync></td>
                 <td style="text-align:center;"><input class="checkbox-compact" type="checkbox" name="{{ key }}[{{ loop.index0 }}][_remove]"></td>
               </tr>
               {% endfor %}
+              {% endif %}
             </tbody>
           </table>
+          {% if paged %}
+          <div class="pager" data-pager="{{ key }}">
+            <button type="button" class="btn btn-ghost" data-page-prev>Prev</button>
+            <span class="muted" data-page-info></span>
+            <button type="button" class="btn btn-ghost" data-page-next>Next</button>
+          </div>
+          {% endif %}
         </div>
       </section>
     {% endfor %}
@@ -268,7 +332,7 @@ tr[data-details='db'] .details-panels .panel-desc{display:none}
   if(btn){ btn.addEventListener('click', function(){ var next=(root.getAttribute('data-theme')==='dark')?'light':'dark'; apply(next); localStorage.setItem(KEY,next); }); }
 })();
 // Filter rows within a section
-document.querySelectorAll('.filter').forEach(function(input){
+document.querySelectorAll('.filter[data-target]').forEach(function(input){
   input.addEventListener('input', function(){
     var targetId=input.getAttribute('data-target');
     var tbody = targetId ? document.getElementById(targetId) : (input.closest('.section-card')?.querySelector('tbody'));
@@ -336,7 +400,15 @@ document.querySelectorAll('tbody tr').forEach(function(tr){ if(!tr.classList.con
 
 function addRow(section){
   const tbody=document.querySelector(`.section-card[data-section="${section}"] tbody`);
-  if(!tbody) return; const uid=`new_${Date.now()}_${Math.floor(Math.random()*10000)}`; const tr=document.createElement('tr');
+  if(!tbody) return; const uid=`new_${Date.now()}_${Math.floor(Math.random()*10000)}`;
+  const tr=buildRow(section, uid);
+  tr.setAttribute('data-new', '1');
+  tbody.appendChild(tr);
+  toggleDbFieldsForRow(tr);
+}
+
+function buildRow(section, uid){
+  const tr=document.createElement('tr');
   tr.innerHTML = `
     <td><input name="${section}[${uid}][name]" required></td>
     <td><input name="${section}[${uid}][repo]"></td>
@@ -385,30 +457,217 @@ function addRow(section){
     <td style=\"text-align:center;\"><input class=\"checkbox-compact\" type=\"checkbox\" name=\"${section}[${uid}][sync-with-db]\" data-sync></td>
     <td style=\"text-align:center;\"><input class=\"checkbox-compact\" type=\"checkbox\" name=\"${section}[${uid}][_remove]\"></td>
   `;
-  tbody.appendChild(tr);
   wireSyncToggles(tr);
   wireDetailsSwitches(tr);
   wireDbDetailsRadios(tr);
-  toggleDbFieldsForRow(tr);
+  return tr;
+}
+{% if paged %}
+// Paged mode: rows load from /api/editor/rows and edits are saved as row operations
+var PAGE_SIZE = {{ page_size }};
+var pagedState = {};
+var pending = {};
+var uidSeq = 0;
+
+function showToast(msg){
+  var box = document.getElementById('toasts');
+  if(!box){ box = document.createElement('div'); box.className = 'toast-container'; box.id = 'toasts'; document.body.appendChild(box); }
+  var t = document.createElement('div'); t.className = 'toast show'; t.textContent = msg; box.appendChild(t);
+  setTimeout(function(){ t.classList.remove('show'); t.style.opacity = 0; }, 3500);
 }
+
+function fieldName(section, uid, field, sub){ return section + '[' + uid + '][' + field + ']' + (sub ? '[' + sub + ']' : ''); }
+
+function fillRow(tr, section, uid, row){
+  ['name','repo','deploy','desc'].forEach(function(f){
+    var el = tr.querySelector('[name="' + fieldName(section, uid, f) + '"]'); if(el) el.value = row[f] || '';
+  });
+  var vis = row.visibility || 'public';
+  tr.querySelectorAll('[name="' + fieldName(section, uid, 'visibility') + '"]').forEach(function(r){ r.checked = (r.value === vis); });
+  var cb = tr.querySelector('[name="' + fieldName(section, uid, 'sync-with-db') + '"]'); if(cb) cb.checked = !!row['sync-with-db'];
+  var db = row['db-attribute'] || {};
+  ['id','title','year','description','image','preview_image','url','category'].forEach(function(k){
+    var el = tr.querySelector('[name="' + fieldName(section, uid, 'db-attribute', k) + '"]'); if(el) el.value = db[k] || '';
+  });
+}
+
+function collectRow(tr){
+  var row = {};
+  tr.querySelectorAll('input[name], textarea[name]').forEach(function(el){
+    var parts = el.name.split('[');
+    if(parts.length < 3 || el.disabled) return;
+    if(el.type === 'radio' && !el.checked) return;
+    var field = parts[2].slice(0, -1);
+    var value = el.type === 'checkbox' ? el.checked : el.value;
+    if(parts.length > 3){ (row[field] = row[field] || {})[parts[3].slice(0, -1)] = value; }
+    else { row[field] = value; }
+  });
+  return row;
+}
+
+function harvest(section){
+  var tbody = document.getElementById('tbody-' + section); if(!tbody) return;
+  tbody.querySelectorAll('tr[data-orig-name][data-dirty]').forEach(function(tr){
+    var name = tr.getAttribute('data-orig-name'); var row = collectRow(tr);
+    var key = JSON.stringify([section, name]);
+    if(row._remove){ pending[key] = {op: 'remove', section: section, name: name}; }
+    else { delete row._remove; pending[key] = {op: 'update', section: section, name: name, row: row}; }
+  });
+}
+
+function loadPage(section){
+  var st = pagedState[section];
+  var params = new URLSearchParams({section: section, page: st.page, per_page: PAGE_SIZE, q: st.q, sort: st.sort, order: st.order});
+  fetch('/api/editor/rows?' + params.toString(), {credentials: 'same-origin'})
+    .then(function(r){ return r.json(); })
+    .then(function(res){
+      if(!res.ok){ showToast(res.error || 'Failed to load rows'); return; }
+      var tbody = document.getElementById('tbody-' + section);
+      tbody.querySelectorAll('tr:not([data-new])').forEach(function(tr){ tr.remove(); });
+      res.rows.forEach(function(row){
+        var uid = 'p' + (uidSeq++);
+        var tr = buildRow(section, uid);
+        var pend = pending[JSON.stringify([section, row.name])];
+        fillRow(tr, section, uid, pend && pend.row ? Object.assign({}, row, pend.row) : row);
+        tr.setAttribute('data-orig-name', row.name);
+        if(pend){
+          tr.setAttribute('data-dirty', '1');
+          var rm = tr.querySelector('[name="' + fieldName(section, uid, '_remove') + '"]'); if(rm) rm.checked = (pend.op === 'remove');
+        }
+        tbody.appendChild(tr);
+        toggleDbFieldsForRow(tr);
+      });
+      st.pages = res.pages;
+      var pager = document.querySelector('[data-pager="' + section + '"]');
+      pager.querySelector('[data-page-info]').textContent = 'Page ' + res.page + ' of ' + res.pages + ' · ' + res.total + ' rows';
+      pager.querySelector('[data-page-prev]').disabled = res.page <= 1;
+      pager.querySelector('[data-page-next]').disabled = res.page >= res.pages;
+    })
+    .catch(function(e){ showToast('Failed to load rows: ' + e); });
+}
+
+function reloadSection(section){ harvest(section); loadPage(section); }
+
+function savePaged(ev){
+  ev.preventDefault();
+  Object.keys(pagedState).forEach(harvest);
+  var ops = Object.keys(pending).map(function(k){ return pending[k]; });
+  document.querySelectorAll('tr[data-new]').forEach(function(tr){
+    var row = collectRow(tr); if(row._remove || !row.name) return; delete row._remove;
+    ops.push({op: 'add', section: tr.closest('.section-card').getAttribute('data-section'), row: row});
+  });
+  if(!ops.length){ showToast('No changes to save'); return false; }
+  if(!confirm('Proceed to save & commit ' + ops.length + ' row change(s)?')) return false;
+  var base = document.querySelector('input[name="base_version"]');
+  var msg = document.querySelector('input[name="commit_message"]');
+  fetch('/api/editor/rows', {
+    method: 'PATCH', credentials: 'same-origin', headers: {'Content-Type': 'application/json'},
+    body: JSON.stringify({base: base.value, message: msg.value, ops: ops})
+  })
+    .then(function(r){ return r.json().then(function(body){ return {status: r.status, body: body}; }); })
+    .then(function(res){
+      if(res.status === 409){
+        // Keep the stale base: adopting the server's version here would let the next
+        // save overwrite the other editor's rows with our whole collected rows
+        if(confirm('Projects changed since this page loaded. Reload to get the latest rows? Unsaved edits on this page will be lost.')){
+          location.reload();
+        } else {
+          showToast('Not saved: reload the page to continue.');
+        }
+        return;
+      }
+      showToast(res.body.message || res.body.error || 'Save failed');
+      if(res.status >= 200 && res.status < 300 && res.body.ok){
+        if(res.body.version){ base.value = res.body.version; }
+        pending = {};
+        document.querySelectorAll('tr[data-new]').forEach(function(tr){ tr.remove(); });
+        Object.keys(pagedState).forEach(loadPage);
+      }
+    })
+    .catch(function(e){ showToast('Save failed: ' + e); });
+  return false;
+}
+
+document.querySelectorAll('.section-card').forEach(function(card){
+  var section = card.getAttribute('data-section');
+  var st = pagedState[section] = {page: 1, pages: 1, q: '', sort: '', order: 'asc'};
+  var tbody = document.getElementById('tbody-' + section);
+  ['input', 'change'].forEach(function(evt){
+    tbody.addEventListener(evt, function(e){ var tr = e.target.closest('tr'); if(tr) tr.setAttribute('data-dirty', '1'); });
+  });
+  var timer = null;
+  card.querySelector('[data-server-filter]').addEventListener('input', function(e){
+    clearTimeout(timer);
+    timer = setTimeout(function(){ st.q = e.target.value.trim(); st.page = 1; reloadSection(section); }, 250);
+  });
+  card.querySelector('[data-sort]').addEventListener('change', function(e){
+    var parts = e.target.value.split(':'); st.sort = parts[0]; st.order = parts[1] || 'asc'; st.page = 1; reloadSection(section);
+  });
+  var pager = card.querySelector('[data-pager]');
+  pager.querySelector('[data-page-prev]').addEventListener('click', function(){ if(st.page > 1){ st.page--; reloadSection(section); } });
+  pager.querySelector('[data-page-next]').addEventListener('click', function(){ if(st.page < st.pages){ st.page++; reloadSection(section); } });
+  loadPage(section);
+});
+{% endif %}
 </script>
 """
 
+# Compiled once per process instead of on every request
+EDITOR_TEMPLATE = app.jinja_env.from_string(TEMPLATE)
+_TEMPLATE_VERSION = hashlib.sha256(TEMPLATE.encode("utf-8")).hexdigest()[:12]
+
+# Rendered editor pages keyed by ETag (template, data version and GitHub status)
+_PAGE_CACHE_SIZE = 8
+_page_cache: dict[str, str] = {}
+_page_cache_lock = threading.Lock()
+
+
+def _data_path() -> Path:
+    # /tmp holds the last save made by this (warm) container; fall back to the bundled file
+    return TMP_DATA if TMP_DATA.exists() else DATA
+
+
+# Documents recently served to editors, by blob sha, as merge bases for their saves.
+# Least recently used first; request threads and the stage pool share it.
+_recent_documents: dict[str, dict[str, Any]] = {}
+_recent_documents_lock = threading.Lock()
+_RECENT_DOCUMENTS_SIZE = 8
+
+
+def load_snapshot() -> projects_cache.Snapshot | None:
+    for path in (_data_path(), DATA):
+        try:
+            snap = projects_cache.load(path)
+        except (OSError, ValueError):
+            continue
+        with _recent_documents_lock:
+            _recent_documents[snap.blob_sha] = _recent_documents.pop(snap.blob_sha, snap.document)
+            while len(_recent_documents) > _RECENT_DOCUMENTS_SIZE:
+                del _recent_documents[next(iter(_recent_documents))]
+        return snap
+    return None
+
+
+def base_document(blob_sha: str) -> dict[str, Any] | None:
+    """The projects.json an editor started from, locally or from GitHub's blob store."""
+    with _recent_documents_lock:
+        document = _recent_documents.pop(blob_sha, None)
+        if document is not None:
+            # Mark it recently used so a base in the middle of a merge is evicted last
+            _recent_documents[blob_sha] = document
+    if document is not None or not gh_client.configured:
+        return document
+    raw = gh_client.get_blob(blob_sha)
+    try:
+        return json.loads(raw) if raw else None
+    except ValueError:
+        return None
+
+
 def load_data() -> dict[str, list[dict[str, Any]]]:
-    data_file = ROOT / "projects.json"
-    loaded: dict[str, Any] = {}
-    if data_file.exists():
-        loaded = json.loads(data_file.read_text(encoding="utf-8"))
-    else:
-        tmp_file = Path("/tmp/projects.json")
-        if tmp_file.exists():
-            loaded = json.loads(tmp_file.read_text(encoding="utf-8"))
     # Return only list-of-dict sections for rendering to avoid Jinja errors
-    filtered: dict[str, list[dict[str, Any]]] = {}
-    for k, v in (loaded or {}).items():
-        if isinstance(v, list) and all(isinstance(r, dict) for r in v):
-            filtered[k] = v
-    return filtered
+    snap = load_snapshot()
+    return snap.sections if snap is not None else {}
 
 
 def normalize(rows: dict[str, dict[str, Any]]) -> list[dict[str, Any]]:
@@ -457,8 +716,241 @@ def _gh_headers() -> dict[str, str]:
     }
 
 
-def github_status() -> dict[str, Any]:
-    status = {
+def _gh_error(r: requests.Response) -> str:
+    try:
+        err = r.json().get("message", "")
+    except Exception:
+        err = r.text[:300]
+    if r.is_redirect or r.status_code in (301, 302, 303, 307, 308):
+        loc = r.headers.get("Location", "")
+        if loc:
+            err = f"redirected to {loc}"
+    return err
+
+
+class _TimedSession(requests.Session):
+    """Session whose calls show up as github_<method> stages in the latency log."""
+
+    def request(self, method, url, *args, **kwargs):  # type: ignore[override]
+        with stage_log.stage(f"github_{method.lower()}"):
+            return super().request(method, url, *args, **kwargs)
+
+
+def _git_blob_sha(content: bytes) -> str:
+    # Same object id git (and the contents API "sha") assigns to a blob
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+
+class GitHubClient:
+    """Keep-alive client for the GitHub contents API.
+
+    One pooled ``requests.Session`` is shared by every call so warm invocations
+    reuse TLS connections. The blob sha of each file is remembered from the last
+    status check or PUT and sent straight away on the next PUT; it is only
+    refetched when GitHub rejects it with 409/422.
+    """
+
+    def __init__(self, token: str, repo: str, branch: str, api_url: str = GITHUB_API_URL) -> None:
+        self.token = token
+        self.repo = repo
+        self.branch = branch
+        self.api_url = api_url
+        self.session = _TimedSession()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=8)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(_gh_headers())
+        self._shas: dict[str, str | None] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.token and self.repo)
+
+    def contents_url(self, path: str) -> str:
+        return f"{self.api_url}/repos/{self.repo}/contents/{path}"
+
+    def remember_sha(self, path: str, sha: str | None) -> None:
+        with self._lock:
+            self._shas[path] = sha
+
+    def forget_sha(self, path: str) -> None:
+        with self._lock:
+            self._shas.pop(path, None)
+
+    def get_contents(self, path: str, etag: str | None = None, timeout: float = 15) -> requests.Response:
+        headers = {"If-None-Match": etag} if etag else None
+        r = self.session.get(
+            self.contents_url(path), params={"ref": self.branch}, headers=headers, allow_redirects=False, timeout=timeout
+        )
+        if r.status_code == 200:
+            self.remember_sha(path, r.json().get("sha"))
+        elif r.status_code == 404:
+            self.remember_sha(path, None)
+        return r
+
+    def get_file_sha(self, path: str) -> str | None:
+        if not self.configured:
+            return None
+        r = self.get_contents(path)
+        if r.status_code == 200:
+            return r.json().get("sha")
+        return None
+
+    def get_blob(self, sha: str) -> bytes | None:
+        r = self.session.get(self._api(f"git/blobs/{sha}"), headers={"Accept": "application/vnd.github.raw+json"}, timeout=15)
+        return r.content if r.status_code == 200 else None
+
+    def get_file(self, path: str) -> tuple[bytes | None, str | None]:
+        """Current (content, blob sha) of ``path``; (None, None) if it does not exist."""
+        r = self.get_contents(path)
+        if r.status_code != 200:
+            return None, None
+        body = r.json()
+        sha = body.get("sha")
+        if body.get("encoding") == "base64" and body.get("content"):
+            return base64.b64decode(body["content"]), sha
+        # Files over 1 MB come back without inline content
+        return self.get_blob(sha), sha
+
+    def _put(self, path: str, content_b64: str, message: str, sha: str | None) -> requests.Response:
+        payload = {"message": message, "content": content_b64, "branch": self.branch}
+        if sha:
+            payload["sha"] = sha
+        return self.session.put(self.contents_url(path), json=payload, allow_redirects=False, timeout=20)
+
+    def upsert_file(
+        self,
+        path: str,
+        content_bytes: bytes,
+        message: str,
+        *,
+        base_sha: str | None = None,
+        rebase: Callable[[bytes | None], bytes] | None = None,
+    ) -> tuple[bool, int, str]:
+        """Create or update ``path``.
+
+        With ``base_sha`` the PUT only succeeds if the file is still at the
+        version the edit started from. When GitHub rejects the sha (409/422) and
+        ``rebase`` is given, it is called with the current remote content and
+        returns the content to retry with; it may raise row_merge.MergeConflict to
+        give up. Without ``rebase`` the latest sha is refetched and the PUT retried
+        once, i.e. the last writer wins.
+        """
+        if not self.configured:
+            return False, 0, "missing token or repo"
+        content_b64 = base64.b64encode(content_bytes).decode("utf-8")
+        if base_sha is not None:
+            sha = base_sha
+        else:
+            with self._lock:
+                known = path in self._shas
+                sha = self._shas.get(path)
+            if not known:
+                sha = self.get_file_sha(path)
+        r = self._put(path, content_b64, message, sha)
+        for attempt in range(MERGE_ATTEMPTS if rebase is not None else 1):
+            if r.status_code not in (409, 422):
+                break
+            if attempt:
+                # Several editors racing for the same file: back off so they stop colliding
+                time.sleep(random.uniform(0, 0.05 * 2 ** attempt))
+            if rebase is None:
+                # Remembered sha is stale (someone else committed); refetch once and retry
+                sha = self.get_file_sha(path)
+            else:
+                remote, sha = self.get_file(path)
+                try:
+                    content_b64 = base64.b64encode(rebase(remote)).decode("utf-8")
+                except row_merge.MergeConflict as exc:
+                    self.remember_sha(path, sha)
+                    return False, 409, str(exc)
+            r = self._put(path, content_b64, message, sha)
+        ok = r.status_code in (200, 201)
+        if ok:
+            self.remember_sha(path, (r.json().get("content") or {}).get("sha"))
+        else:
+            self.forget_sha(path)
+        return ok, r.status_code, "" if ok else _gh_error(r)
+
+    def _api(self, path: str) -> str:
+        return f"{self.api_url}/repos/{self.repo}/{path}"
+
+    def commit_tree(
+        self, message: str, build: Callable[[Callable[[str], bytes | None]], dict[str, bytes]]
+    ) -> tuple[bool, int, str]:
+        """Write several files as one commit through the Git Data API.
+
+        ``build`` receives a reader for files in the current head tree and returns
+        ``{path: content}``. Files whose blob is unchanged are left out; if nothing
+        changed no commit is made. The ref update is a fast-forward only, so a
+        concurrent push makes us rebuild on the new head once and retry.
+        """
+        if not self.configured:
+            return False, 0, "missing token or repo"
+        for _attempt in range(2):
+            r = self.session.get(self._api(f"git/ref/heads/{self.branch}"), timeout=15)
+            if r.status_code != 200:
+                return False, r.status_code, _gh_error(r)
+            head_sha = r.json()["object"]["sha"]
+            r = self.session.get(self._api(f"git/commits/{head_sha}"), timeout=15)
+            if r.status_code != 200:
+                return False, r.status_code, _gh_error(r)
+            base_tree = r.json()["tree"]["sha"]
+            r = self.session.get(self._api(f"git/trees/{base_tree}"), params={"recursive": "1"}, timeout=15)
+            if r.status_code != 200:
+                return False, r.status_code, _gh_error(r)
+            existing = {e["path"]: e["sha"] for e in r.json().get("tree", []) if e.get("type") == "blob"}
+
+            def read(path: str) -> bytes | None:
+                sha = existing.get(path)
+                if not sha:
+                    return None
+                return self.get_blob(sha)
+
+            try:
+                files = build(read)
+            except row_merge.MergeConflict as exc:
+                return False, 409, str(exc)
+            changed = {p: c for p, c in files.items() if existing.get(p) != _git_blob_sha(c)}
+            if not changed:
+                return True, 200, "no changes"
+            entries = [
+                {"path": p, "mode": "100644", "type": "blob", "content": c.decode("utf-8")} for p, c in changed.items()
+            ]
+            r = self.session.post(self._api("git/trees"), json={"base_tree": base_tree, "tree": entries}, timeout=20)
+            if r.status_code != 201:
+                return False, r.status_code, _gh_error(r)
+            tree_sha = r.json()["sha"]
+            r = self.session.post(
+                self._api("git/commits"), json={"message": message, "tree": tree_sha, "parents": [head_sha]}, timeout=20
+            )
+            if r.status_code != 201:
+                return False, r.status_code, _gh_error(r)
+            commit_sha = r.json()["sha"]
+            r = self.session.patch(
+                self._api(f"git/refs/heads/{self.branch}"), json={"sha": commit_sha, "force": False}, timeout=20
+            )
+            if r.status_code == 200:
+                for p, c in files.items():
+                    self.remember_sha(p, _git_blob_sha(c))
+                return True, r.status_code, ""
+            if r.status_code != 422:
+                return False, r.status_code, _gh_error(r)
+            # 422: branch moved since we read it (not a fast-forward); rebuild on the new head
+        return False, r.status_code, _gh_error(r)
+
+
+gh_client = GitHubClient(GITHUB_TOKEN, GITHUB_REPO, GITHUB_BRANCH)
+
+
+# Last known GitHub status, shared across requests in a warm container.
+_gh_status_lock = threading.Lock()
+_gh_status_cache: dict[str, Any] = {"value": None, "etag": None, "fetched_at": 0.0, "refreshing": False}
+
+
+def _gh_status_base() -> dict[str, Any]:
+    return {
         "repo": GITHUB_REPO,
         "branch": GITHUB_BRANCH,
         "path": TARGET_REMOTE_PATH,
@@ -466,61 +958,167 @@ def github_status() -> dict[str, Any]:
         "status": "not configured" if not (GITHUB_TOKEN and GITHUB_REPO) else "checking",
         "message": "",
     }
-    if not (GITHUB_TOKEN and GITHUB_REPO):
-        return status
+
+
+def _refresh_github_status() -> dict[str, Any]:
+    """Revalidate the cached status with a conditional GET (If-None-Match)."""
+    with _gh_status_lock:
+        previous = _gh_status_cache["value"]
+        etag = _gh_status_cache["etag"] if previous is not None else None
+    status = _gh_status_base()
     try:
-        url = f"https://api.github.com/repos/{GITHUB_REPO}/contents/{TARGET_REMOTE_PATH}?ref={GITHUB_BRANCH}"
-        r = requests.get(url, headers=_gh_headers(), allow_redirects=False, timeout=10)
-        if r.status_code == 200:
+        r = gh_client.get_contents(TARGET_REMOTE_PATH, etag=etag, timeout=10)
+        if r.status_code == 304 and previous is not None:
+            # Unchanged since last check; 304s do not count against the rate limit
+            status = dict(previous)
+        elif r.status_code == 200:
             status["status"] = "ok"
             status["message"] = "file reachable"
+            etag = r.headers.get("ETag")
         elif r.status_code == 404:
             status["status"] = "ok"
             status["message"] = "file will be created on first commit"
+            etag = None
         else:
             status["status"] = f"{r.status_code}"
             status["message"] = (r.json().get("message") if r.headers.get("content-type","" ).startswith("application/json") else r.text)[:200]
+            etag = None
     except Exception as e:
         status["status"] = "error"
         status["message"] = str(e)
-    return status
+        etag = None
+    with _gh_status_lock:
+        _gh_status_cache.update(value=status, etag=etag, fetched_at=time.monotonic(), refreshing=False)
+    return dict(status)
 
 
-def github_get_file_sha(path: str) -> str | None:
-    if not (GITHUB_TOKEN and GITHUB_REPO):
-        return None
-    url = f"https://api.github.com/repos/{GITHUB_REPO}/contents/{path}?ref={GITHUB_BRANCH}"
-    r = requests.get(url, headers=_gh_headers(), allow_redirects=False, timeout=15)
-    if r.status_code == 200:
-        return r.json().get("sha")
-    return None
+def _record_github_put() -> None:
+    """Refresh the status cache after a successful contents PUT instead of re-fetching."""
+    status = _gh_status_base()
+    status["status"] = "ok"
+    status["message"] = "file reachable"
+    with _gh_status_lock:
+        # The PUT response carries no contents ETag; the next revalidation does a full GET
+        _gh_status_cache.update(value=status, etag=None, fetched_at=time.monotonic(), refreshing=False)
 
 
-def github_upsert_file(path: str, content_bytes: bytes, message: str) -> tuple[bool, int, str]:
+def github_status() -> dict[str, Any]:
+    """Return the GitHub status, cached for GITHUB_STATUS_TTL seconds.
+
+    Stale entries are served immediately while a background thread revalidates them.
+    """
     if not (GITHUB_TOKEN and GITHUB_REPO):
-        return False, 0, "missing token or repo"
-    sha = github_get_file_sha(path)
-    url = f"https://api.github.com/repos/{GITHUB_REPO}/contents/{path}"
-    payload = {
-        "message": message,
-        "content": base64.b64encode(content_bytes).decode("utf-8"),
-        "branch": GITHUB_BRANCH,
+        return _gh_status_base()
+    with _gh_status_lock:
+        cached = _gh_status_cache["value"]
+        if cached is not None:
+            if time.monotonic() - _gh_status_cache["fetched_at"] >= GITHUB_STATUS_TTL and not _gh_status_cache["refreshing"]:
+                _gh_status_cache["refreshing"] = True
+                threading.Thread(target=_refresh_github_status, daemon=True).start()
+            return dict(cached)
+    return _refresh_github_status()
+
+
+def _derived_files(data: dict[str, Any], content_bytes: bytes, read: Callable[[str], bytes | None]) -> dict[str, bytes]:
+    """projects.json plus the readme.md and db_products.json it generates."""
+    import generate_readme
+    import sync_neon_db
+
+    files = {TARGET_REMOTE_PATH: content_bytes}
+    readme = read(README_REMOTE_PATH)
+    if readme is not None:
+        rendered = generate_readme.render_readme(data, readme.decode("utf-8"))
+        files[README_REMOTE_PATH] = rendered.encode("utf-8")
+    previous_mirror = read(MIRROR_REMOTE_PATH)
+    files[MIRROR_REMOTE_PATH] = sync_neon_db.mirror_bytes(
+        sync_neon_db._prepare_records(data),
+        previous_mirror.decode("utf-8") if previous_mirror is not None else "[]",
+    )
+    return files
+
+
+def canonical_document(document: dict[str, Any]) -> dict[str, Any]:
+    """``document`` as the full editor form would submit it unchanged.
+
+    Form saves rewrite every row through normalize, so merges against them
+    compare canonical rows; otherwise formatting differences read as edits.
+    """
+    return {
+        k: normalize({str(i): r for i, r in enumerate(v)}) if isinstance(v, list) and all(isinstance(r, dict) for r in v) else v
+        for k, v in document.items()
     }
-    if sha:
-        payload["sha"] = sha
-    r = requests.put(url, headers=_gh_headers(), json=payload, allow_redirects=False, timeout=20)
-    ok = r.status_code in (200, 201)
-    err = ""
-    if not ok:
-        try:
-            err = r.json().get("message", "")
-        except Exception:
-            err = r.text[:300]
-        if r.is_redirect or r.status_code in (301, 302, 303, 307, 308):
-            loc = r.headers.get("Location", "")
-            if loc:
-                err = f"redirected to {loc}"
-    return ok, r.status_code, err
+
+
+def _merging(
+    base_document: dict[str, Any], data: dict[str, Any], canonical: bool
+) -> tuple[Callable[[bytes | None], dict[str, Any]], dict[str, Any]]:
+    """A rebase function merging our edits onto each remote copy, and its state.
+
+    ``state["data"]`` always holds the document most recently merged, which is
+    what ends up committed.
+    """
+    state = {"base": base_document, "data": data}
+
+    def merge(remote: bytes | None) -> dict[str, Any]:
+        theirs = json.loads(remote) if remote else {}
+        if canonical:
+            theirs = canonical_document(theirs)
+        if theirs != state["base"]:
+            state["data"] = row_merge.merge_documents(state["base"], theirs, state["data"])
+            state["base"] = theirs
+        return state["data"]
+
+    return merge, state
+
+
+def github_commit_projects(
+    data: dict[str, Any],
+    content_bytes: bytes,
+    message: str,
+    base: tuple[str, dict[str, Any]] | None = None,
+    canonical: bool = False,
+) -> tuple[bool, int, str, dict[str, Any]]:
+    """Commit projects.json using the configured GITHUB_COMMIT_MODE.
+
+    ``base`` is the (blob sha, document) the edit started from. With it the
+    commit is conditional on that version, and concurrent commits are merged row
+    by row instead of overwritten; ``canonical`` says ``data`` came from a full
+    form save (see canonical_document). Returns (ok, status, error, committed document).
+    """
+    if base is None:
+        if GITHUB_COMMIT_MODE != "tree":
+            return (*github_upsert_file(TARGET_REMOTE_PATH, content_bytes, message), data)
+        ok, code, err = gh_client.commit_tree(message, lambda read: _derived_files(data, content_bytes, read))
+    else:
+        base_sha, base_doc = base
+        merge, state = _merging(canonical_document(base_doc) if canonical else base_doc, data, canonical)
+        if GITHUB_COMMIT_MODE != "tree":
+            ok, code, err = gh_client.upsert_file(
+                TARGET_REMOTE_PATH, content_bytes, message, base_sha=base_sha,
+                rebase=lambda remote: json.dumps(merge(remote), indent=2).encode("utf-8"),
+            )
+        else:
+            def build(read: Callable[[str], bytes | None]) -> dict[str, bytes]:
+                merged = merge(read(TARGET_REMOTE_PATH))
+                body = content_bytes if merged is data else json.dumps(merged, indent=2).encode("utf-8")
+                return _derived_files(merged, body, read)
+
+            ok, code, err = gh_client.commit_tree(message, build)
+        data = state["data"]
+    if ok:
+        _record_github_put()
+    return ok, code, err, data
+
+
+def github_get_file_sha(path: str) -> str | None:
+    return gh_client.get_file_sha(path)
+
+
+def github_upsert_file(path: str, content_bytes: bytes, message: str) -> tuple[bool, int, str]:
+    ok, code, err = gh_client.upsert_file(path, content_bytes, message)
+    if ok and path == TARGET_REMOTE_PATH:
+        _record_github_put()
+    return ok, code, err
 
 
 @app.before_request
@@ -552,66 +1150,465 @@ def logout():
 @app.get("/api/editor")
 @app.get("/")
 def index():
-    data = load_data()
+    snap = load_snapshot()
+    # Cached snapshot sections are already filtered to dict[str, list[dict]]
+    data = snap.sections if snap is not None else {}
+    version = snap.version if snap is not None else ""
+    paged_arg = request.args.get("paged")
+    if paged_arg in ("0", "1"):
+        paged = paged_arg == "1"
+    else:
+        paged = sum(len(rows) for rows in data.values()) > EDITOR_PAGED_THRESHOLD
     gh = github_status()
-    # Ensure template always receives dict[str, list[dict]]
-    safe_data = {k: v for k, v in (data or {}).items() if isinstance(v, list) and all(isinstance(r, dict) for r in v)}
-    return render_template_string(TEMPLATE, data=safe_data, gh=gh)
+    base_sha = snap.blob_sha if snap is not None else ""
+    context = {"data": data, "gh": gh, "version": version, "base_sha": base_sha, "paged": paged, "page_size": EDITOR_PAGE_SIZE}
+    if session.get("_flashes"):
+        # Flash messages are per-user and consumed by this render; never cache it
+        return render_template(EDITOR_TEMPLATE, **context)
+
+    key = json.dumps([_TEMPLATE_VERSION, version, paged, EDITOR_PAGE_SIZE, gh], sort_keys=True)
+    etag = hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+    if request.if_none_match.contains_weak(etag):
+        resp = Response(status=304)
+    else:
+        with _page_cache_lock:
+            html = _page_cache.get(etag)
+        if html is None:
+            html = render_template(EDITOR_TEMPLATE, **context)
+            with _page_cache_lock:
+                _page_cache[etag] = html
+                while len(_page_cache) > _PAGE_CACHE_SIZE:
+                    _page_cache.pop(next(iter(_page_cache)))
+        resp = Response(html, mimetype="text/html")
+    resp.set_etag(etag)
+    # Let the browser keep the page but revalidate on every load
+    resp.headers["Cache-Control"] = "private, no-cache"
+    return resp
+
+
+ROW_SORT_FIELDS = ("name", "repo", "visibility", "deploy", "desc", "sync-with-db")
+
+# Row orders and search text for the paged editor; only the current data version is kept.
+# Orders are cached per (section, sort, descending), so the cache is bounded by the
+# sections and ROW_SORT_FIELDS; searches filter a cached order per request.
+_row_view_lock = threading.Lock()
+_row_views: dict[tuple[str, str, bool], list[int]] = {}
+_row_texts: dict[str, list[str]] = {}
+_row_view_version = ""
+
+
+def _row_haystack(row: dict[str, Any]) -> str:
+    parts = [str(row.get(k) or "") for k in ("name", "repo", "visibility", "deploy", "desc")]
+    parts.extend(str(v) for v in (row.get("db-attribute") or {}).values() if v)
+    return "\n".join(parts).lower()
+
+
+def row_view(snap: projects_cache.Snapshot, section: str, sort: str = "", descending: bool = False, q: str = "") -> list[int]:
+    """Indices into ``snap.sections[section]`` matching ``q`` (lower-cased), in the requested order."""
+    global _row_view_version
+    key = (section, sort, descending)
+    with _row_view_lock:
+        if _row_view_version != snap.version:
+            _row_views.clear()
+            _row_texts.clear()
+            _row_view_version = snap.version
+        view = _row_views.get(key)
+        texts = _row_texts.get(section) if q else None
+    rows = snap.sections.get(section, [])
+    if view is None:
+        view = list(range(len(rows)))
+        if sort:
+            view.sort(key=lambda i: str(rows[i].get(sort) or "").lower(), reverse=descending)
+    if q and texts is None:
+        texts = [_row_haystack(r) for r in rows]
+    with _row_view_lock:
+        if _row_view_version == snap.version:
+            _row_views[key] = view
+            if texts is not None:
+                _row_texts[section] = texts
+    if not q:
+        return view
+    return [i for i in view if q in texts[i]]
+
+
+@app.get("/api/editor/rows")
+def list_rows():
+    """One page of a section's rows, filtered and sorted server-side, for the paged editor."""
+    snap = load_snapshot()
+    if snap is None:
+        return jsonify({"ok": False, "error": "projects.json not available"}), 503
+    section = request.args.get("section", "")
+    if section not in snap.sections:
+        return jsonify({"ok": False, "error": f"unknown section '{section}'"}), 404
+    sort = request.args.get("sort", "")
+    if sort and sort not in ROW_SORT_FIELDS:
+        return jsonify({"ok": False, "error": f"sort must be one of {ROW_SORT_FIELDS}"}), 400
+    page = max(1, request.args.get("page", 1, type=int) or 1)
+    per_page = min(500, max(1, request.args.get("per_page", EDITOR_PAGE_SIZE, type=int) or EDITOR_PAGE_SIZE))
+    q = (request.args.get("q") or "").strip().lower()
+
+    view = row_view(snap, section, sort, request.args.get("order") == "desc", q)
+    rows = snap.sections[section]
+    start = (page - 1) * per_page
+    return jsonify({
+        "ok": True,
+        "section": section,
+        "page": page,
+        "per_page": per_page,
+        "pages": max(1, -(-len(view) // per_page)),
+        "total": len(view),
+        "version": snap.version,
+        "rows": [rows[i] for i in view[start:start + per_page]],
+    })
 
 
 @app.post("/api/editor")
 @app.post("/api/editor/save")
 def save():
     # session-based auth enforced by before_request
-    raw = request.form.to_dict(flat=False)
-    grouped: dict[str, dict[str, dict[str, Any]]] = {}
-    key_pattern = re.compile(r"([^\[]+)\[([^\]]+)\](?:\[([^\]]+)\](?:\[([^\]]+)\])?)?")
-    for full_key, values in raw.items():
-        value = values[-1] if values else ""
-        m = key_pattern.fullmatch(full_key)
-        if not m:
-            continue
-        section, idx, field, subfield = m.groups()
-        bucket = grouped.setdefault(section, {}).setdefault(idx, {})
-        if subfield:
-            bucket.setdefault(field, {})[subfield] = value
-        else:
-            bucket[field] = value
-
-    data: dict[str, list[dict[str, Any]]] = {}
-    for section, rows in grouped.items():
-        data[section] = normalize(rows)
+    data = form_parser.parse_sections(request.form, normalize)
 
     # Preserve non-list metadata keys from the original file
-    try:
-        original = json.loads((ROOT / "projects.json").read_text(encoding="utf-8"))
-        for k, v in original.items():
+    original = load_snapshot()
+    if original is not None:
+        for k, v in original.document.items():
             if not isinstance(v, list):
                 data[k] = v
-    except Exception:
-        pass
 
-    content_bytes = json.dumps(data, indent=2).encode("utf-8")
+    # The blob sha the page was rendered from; concurrent commits since then get merged
+    base_sha = (request.form.get("base_sha") or "").strip()
+    base_doc = base_document(base_sha) if base_sha else None
+    base = (base_sha, base_doc) if base_doc is not None else None
+
+    commit_message = request.form.get("commit_message") or "Update projects.json"
+    _ok, summary = publish_document(data, commit_message, base, canonical=True)
+    flash(summary)
+
+    return redirect("/api/editor")
+
+
+ROW_OPS = ("add", "update", "remove")
+# Row fields normalize() reads as text; anything else in a PATCH body is rejected
+ROW_TEXT_FIELDS = ("name", "repo", "visibility", "deploy", "desc")
+
+
+def apply_row_ops(document: dict[str, Any], ops: list[dict[str, Any]]) -> dict[str, Any]:
+    """Apply add/update/remove row operations keyed by section+name.
+
+    Returns a new document; only the touched sections are copied, every other
+    section is shared with ``document``. Raises ValueError for an invalid op.
+    """
+    data = dict(document)
+    positions: dict[str, dict[str, int]] = {}
+
+    def _section(name: str) -> tuple[list[dict[str, Any]], dict[str, int]]:
+        if name not in positions:
+            current = data.get(name)
+            if current is not None and not (isinstance(current, list) and all(isinstance(r, dict) for r in current)):
+                raise ValueError(f"'{name}' is not a project section")
+            data[name] = list(current or [])
+            positions[name] = {r.get("name"): i for i, r in enumerate(data[name])}
+        return data[name], positions[name]
+
+    def _clean(row: dict[str, Any]) -> dict[str, Any]:
+        cleaned = normalize({"patch": row})
+        if not cleaned:
+            raise ValueError("row must have a name")
+        return cleaned[0]
+
+    removed: set[tuple[str, int]] = set()
+    for n, op in enumerate(ops):
+        if not isinstance(op, dict):
+            raise ValueError(f"ops[{n}]: must be an object")
+        kind = op.get("op")
+        section = op.get("section")
+        if kind not in ROW_OPS or not isinstance(section, str) or not section:
+            raise ValueError(f"ops[{n}]: expected op in {ROW_OPS} and a section")
+        rows, index = _section(section)
+        row = op.get("row") or {}
+        if not isinstance(row, dict):
+            raise ValueError(f"ops[{n}]: row must be an object")
+        for field in ROW_TEXT_FIELDS:
+            if row.get(field) is not None and not isinstance(row[field], str):
+                raise ValueError(f"ops[{n}]: row.{field} must be a string")
+        if row.get("db-attribute") is not None and not isinstance(row["db-attribute"], dict):
+            raise ValueError(f"ops[{n}]: row.db-attribute must be an object")
+        if kind == "add":
+            item = _clean(row)
+            if item["name"] in index:
+                raise ValueError(f"ops[{n}]: '{item['name']}' already exists in {section}")
+            index[item["name"]] = len(rows)
+            rows.append(item)
+            continue
+        name = op.get("name")
+        if not isinstance(name, str):
+            raise ValueError(f"ops[{n}]: name must be a string")
+        pos = index.get(name)
+        if pos is None:
+            raise ValueError(f"ops[{n}]: '{name}' not found in {section}")
+        if kind == "remove":
+            del index[name]
+            removed.add((section, pos))
+            continue
+        item = _clean({**rows[pos], **row})
+        if item["name"] != name:
+            if item["name"] in index:
+                raise ValueError(f"ops[{n}]: '{item['name']}' already exists in {section}")
+            del index[name]
+            index[item["name"]] = pos
+        rows[pos] = item
+    # Drop removed rows last so positions stay valid while applying ops
+    for section in {s for s, _ in removed}:
+        data[section] = [r for i, r in enumerate(data[section]) if (section, i) not in removed]
+    return data
+
+
+def _neon_sync_job() -> bool:
+    import sync_neon_db as neon_sync  # lazy import to keep cold start small; its pool stays warm in sys.modules
+    # Idempotent: the diff sync converges on whatever /tmp/projects.json holds when it runs
+    return neon_sync.sync_from_env(strict=True)
+
+
+def _store_local(data: dict[str, Any], content_bytes: bytes | None = None) -> None:
     try:
-        (Path("/tmp") / "projects.json").write_text(content_bytes.decode("utf-8"), encoding="utf-8")
+        # Also replaces the cached snapshot, so the next render skips parsing
+        with stage_log.stage("store_tmp"):
+            projects_cache.store(TMP_DATA, data, content_bytes)
     except Exception:
         pass
 
-    commit_message = request.form.get("commit_message") or "Update projects.json"
-    ok, code, err = github_upsert_file(TARGET_REMOTE_PATH, content_bytes, commit_message)
-    if ok:
-        neon_msg = ""
+
+def publish_document(
+    data: dict[str, Any], message: str, base: tuple[str, dict[str, Any]] | None = None, canonical: bool = False
+) -> tuple[bool, str]:
+    """Commit ``data`` to GitHub, keep it locally, then queue the Neon sync.
+
+    ``base`` and ``canonical`` are passed to github_commit_projects. Every
+    GitHub request carries its own timeout; one that times out leaves the commit
+    outcome unknown, and is reported as such rather than as a failure. The
+    response goes out as soon as the commit lands: Neon is synced by a background job (poll GET
+    /api/editor/jobs/<id>), and only with a document that was committed, so a
+    failed commit never reaches the database.
+
+    /tmp/projects.json only ever takes a committed document (merged, if the
+    commit had to merge in concurrent edits), so the base every editor page
+    embeds is a version GitHub knows. Without GitHub credentials it takes
+    ``data`` as-is. Returns (saved, human readable summary): saved means the
+    document was stored locally, which needs a confirmed commit unless GitHub
+    is not configured at all.
+    """
+    content_bytes = json.dumps(data, indent=2).encode("utf-8")
+    started = time.perf_counter()
+    committed_ok = stored = False
+    if not gh_client.configured:
+        _store_local(data, content_bytes)
+        stored = True
+        gh_msg = "Saved locally; GitHub commit skipped (missing token or repo)."
+    else:
         try:
-            import sync_neon_db as neon_sync  # lazy import to keep cold start small
-            did_sync = neon_sync.sync_from_env(strict=True)
-            neon_msg = "Neon DB synced." if did_sync else "Neon DB sync skipped (missing secret)."
+            committed_ok, code, err, committed_doc = github_commit_projects(data, content_bytes, message, base, canonical)
+            gh_msg = f"Commit failed ({code}): {err}"
+        except requests.Timeout as exc:
+            # The request may have reached GitHub; only a reload can tell whether it landed
+            gh_msg = f"Commit outcome unknown: GitHub did not answer in time ({exc}). Reload to check."
+        except Exception as exc:
+            gh_msg = f"Commit failed: {exc}"
+        if committed_ok:
+            committed = "projects.json, readme.md and db_products.json" if GITHUB_COMMIT_MODE == "tree" else "projects.json"
+            gh_msg = f"Saved and committed {committed} ({time.perf_counter() - started:.1f}s)."
+            if committed_doc is not data:
+                _store_local(committed_doc)
+                gh_msg += " Merged with changes committed by another editor."
+            else:
+                _store_local(data, content_bytes)
+            stored = True
+
+    if not os.getenv("NEON_DATABASE_URL", "").strip():
+        neon_msg = "Neon DB sync skipped (missing secret)."
+    elif not stored:
+        neon_msg = "Neon DB sync skipped (commit not confirmed)."
+    else:
+        try:
+            # The job syncs whatever /tmp/projects.json holds when it runs, so
+            # back-to-back saves converge on the latest committed copy
+            neon_msg = f"Neon DB sync queued (job {jobs.submit('neon-sync', _neon_sync_job)})."
         except Exception as exc:
             neon_msg = f"Neon DB sync failed: {exc}"
-        flash(f"Saved and committed projects.json. {neon_msg}")
+    return stored, f"{gh_msg} {neon_msg}"
+
+
+@dataclass(frozen=True)
+class PublicBody:
+    """One public JSON response, serialized and compressed once per data version."""
+
+    raw: bytes
+    compressed: dict[str, bytes]  # encoding -> body
+    etag: str  # strong validator of ``raw``; each encoding gets its own suffix
+    last_modified: datetime
+
+
+_public_lock = threading.Lock()
+_public_bodies: dict[str, PublicBody] = {}
+_public_version = ""
+
+
+def _public_body(snap: projects_cache.Snapshot, scope: str, payload: Callable[[], Any]) -> PublicBody:
+    global _public_version
+    with _public_lock:
+        if _public_version != snap.version:
+            _public_bodies.clear()
+            _public_version = snap.version
+        body = _public_bodies.get(scope)
+    if body is None:
+        raw = json.dumps(payload(), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        body = PublicBody(
+            raw=raw,
+            compressed=precompress.variants(raw),
+            etag=hashlib.sha256(raw).hexdigest()[:32],
+            last_modified=datetime.fromtimestamp(snap.stat_key[0] / 1e9, tz=timezone.utc).replace(microsecond=0),
+        )
+        with _public_lock:
+            if _public_version == snap.version:
+                _public_bodies[scope] = body
+    return body
+
+
+def _public_response(body: PublicBody) -> Response:
+    encoding = precompress.negotiate(request.accept_encodings, body.compressed)
+    etag = f"{body.etag}-{encoding}" if encoding else body.etag
+    # Any encoding of the same version validates; the bytes only differ in transfer coding
+    tags = [body.etag, *(f"{body.etag}-{e}" for e in body.compressed)]
+    if request.if_none_match:
+        fresh = any(request.if_none_match.contains_weak(t) for t in tags)
     else:
-        flash(f"Commit failed ({code}): {err}")
+        fresh = request.if_modified_since is not None and request.if_modified_since >= body.last_modified
+    resp = Response(status=304) if fresh else Response(body.compressed[encoding] if encoding else body.raw, mimetype="application/json")
+    if encoding and not fresh:
+        resp.headers["Content-Encoding"] = encoding
+    resp.set_etag(etag)
+    resp.last_modified = body.last_modified
+    resp.headers["Cache-Control"] = PUBLIC_CACHE_CONTROL
+    resp.headers["Vary"] = "Accept-Encoding"
+    return resp
 
-    return redirect("/api/editor")
+
+@app.get("/api/projects")
+def public_projects():
+    """Every projects.json row section, read-only and CDN cacheable."""
+    snap = load_snapshot()
+    if snap is None:
+        return jsonify({"ok": False, "error": "projects.json not available"}), 503
+    return _public_response(_public_body(snap, "*", lambda: snap.sections))
+
+
+@app.get("/api/projects/<path:key>")
+def public_project(key: str):
+    """A section's rows, or one project by product id, name or repo (URL or owner/name)."""
+    snap = load_snapshot()
+    if snap is None:
+        return jsonify({"ok": False, "error": "projects.json not available"}), 503
+    if key in snap.sections:
+        return _public_response(_public_body(snap, f"section:{key}", lambda: snap.sections[key]))
+    ref = project_model.for_snapshot(snap).get(key)
+    if ref is None:
+        return jsonify({"ok": False, "error": f"no section or project '{key}'"}), 404
+    return _public_response(_public_body(
+        snap, f"project:{ref.section}:{ref.index}", lambda: {"section": ref.section, "index": ref.index, "project": ref.row}
+    ))
+
+
+@app.get("/api/products/search")
+def product_search():
+    """Full-text search over the Neon products table.
+
+    Query: ``q`` (web search syntax, optional), ``category``, ``year``, ``limit``
+    and ``offset``. ``next_offset`` is null on the last page.
+    """
+    import sync_neon_db as neon_sync
+
+    dsn = neon_sync._normalize_neon_dsn(os.getenv("NEON_DATABASE_URL", "").strip())
+    if not dsn:
+        return jsonify({"ok": False, "error": "product search is not configured"}), 503
+    try:
+        limit = min(max(int(request.args.get("limit", SEARCH_PAGE_SIZE)), 1), SEARCH_MAX_PAGE_SIZE)
+        offset = max(int(request.args.get("offset", 0)), 0)
+    except ValueError:
+        return jsonify({"ok": False, "error": "limit and offset must be integers"}), 400
+    table = (os.getenv("NEON_TABLE") or neon_sync.DEFAULT_TABLE_NAME).strip()
+    try:
+        with stage_log.stage("neon_search"):
+            # One extra row tells whether there is a next page without a COUNT(*)
+            rows = neon_sync.search_products(
+                dsn,
+                table,
+                request.args.get("q", "").strip(),
+                request.args.get("category") or None,
+                request.args.get("year") or None,
+                limit + 1,
+                offset,
+            )
+    except neon_sync.SchemaOutdatedError as exc:
+        print(f"Product search unavailable: {exc}", file=sys.stderr)
+        return jsonify({"ok": False, "error": "product search is not available yet"}), 503
+    except Exception as exc:
+        print(f"Product search failed: {exc}", file=sys.stderr)
+        return jsonify({"ok": False, "error": "product search failed"}), 502
+    more = len(rows) > limit
+    items = [{**r, "updated_at": r["updated_at"].isoformat() if r.get("updated_at") else None} for r in rows[:limit]]
+    resp = jsonify({"ok": True, "items": items, "next_offset": offset + limit if more else None})
+    resp.headers["Cache-Control"] = PUBLIC_CACHE_CONTROL
+    return resp
+
+
+@app.get("/api/editor/jobs/<job_id>")
+def job_status(job_id: str):
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"ok": False, "error": "unknown job"}), 404
+    job.pop("trace", None)
+    return jsonify({"ok": True, "job": job})
+
+
+@app.patch("/api/editor/rows")
+def patch_rows():
+    """Apply row-level edits to the current document and commit the result.
+
+    Body: {"base": <version>, "message": str, "ops": [{"op": "add"|"update"|"remove",
+    "section": str, "name": str, "row": {...}}]}. ``base`` is required and must match
+    the current data version (returned by this endpoint and embedded in the editor page).
+    """
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict):
+        return jsonify({"ok": False, "error": "body must be a JSON object"}), 400
+    ops = body.get("ops")
+    if not isinstance(ops, list) or not ops:
+        return jsonify({"ok": False, "error": "ops must be a non-empty list"}), 400
+    message = body.get("message")
+    if message is not None and not isinstance(message, str):
+        return jsonify({"ok": False, "error": "message must be a string"}), 400
+    base = body.get("base")
+    if not isinstance(base, str) or not base:
+        return jsonify({"ok": False, "error": "base version is required"}), 400
+    snap = load_snapshot()
+    if snap is None:
+        return jsonify({"ok": False, "error": "projects.json not available"}), 503
+    if base != snap.version:
+        return jsonify({"ok": False, "error": "stale base version", "version": snap.version}), 409
+    try:
+        data = apply_row_ops(snap.document, ops)
+    except ValueError as exc:
+        return jsonify({"ok": False, "error": str(exc), "version": snap.version}), 400
+
+    ok, summary = publish_document(data, message or "Update projects.json", (snap.blob_sha, snap.document))
+    current = load_snapshot()
+    payload = {
+        "ok": ok,
+        "committed": ok and gh_client.configured,
+        "message": summary,
+        "version": current.version if current else None,
+    }
+    # Without GitHub the local save is the whole save; 502 is for commits that failed upstream
+    return jsonify(payload), (200 if ok else 502)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,5 @@
+"""Benchmarks for the editor, README generator and Neon sync hot paths.
+
+Run the suite with ``python -m benchmarks.suite``; generate synthetic data with
+``python -m benchmarks.synthetic``.
+"""
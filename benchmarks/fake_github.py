@@ -0,0 +1,162 @@
+"""A local stand-in for the GitHub contents API used by api/index.py.
+
+Serves GET/PUT /repos/<owner>/<repo>/contents/<path> (plus GET git/blobs/<sha>
+for any version it has stored) with blob shas, ETags and
+the same conflict rules as GitHub: a PUT must carry the file's current sha
+(422 when it is missing for an existing file, 409 when it is stale). Every
+request sleeps ``latency`` seconds plus up to ``jitter`` to mimic the network.
+
+Usage: python -m benchmarks.fake_github [--port 8765] [--latency 0.08] [--jitter 0.04]
+                                        [--seed projects.json]
+then start the editor with GITHUB_API_URL=http://127.0.0.1:8765.
+GET /_stats returns request, commit and conflict counters.
+"""
+from __future__ import annotations
+
+import argparse
+import base64
+import hashlib
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from flask import Flask, Response, jsonify, request
+from werkzeug.serving import BaseWSGIServer, WSGIRequestHandler, make_server
+
+
+def blob_sha(content: bytes) -> str:
+    return hashlib.sha1(b"blob %d\0" % len(content) + content).hexdigest()
+
+
+class FakeRepo:
+    """Files of one branch, keyed by path; thread-safe."""
+
+    def __init__(self) -> None:
+        self.files: dict[str, bytes] = {}
+        self.blobs: dict[str, bytes] = {}  # every version ever stored, for git/blobs
+        self.lock = threading.Lock()
+        self.stats = {"gets": 0, "not_modified": 0, "puts": 0, "commits": 0, "conflicts": 0}
+
+    def seed(self, path: str, content: bytes) -> None:
+        with self.lock:
+            self.files[path] = content
+            self.blobs[blob_sha(content)] = content
+
+    def count(self, key: str) -> None:
+        with self.lock:
+            self.stats[key] += 1
+
+
+def create_app(repo: FakeRepo | None = None, latency: float = 0.0, jitter: float = 0.0) -> Flask:
+    repo = repo or FakeRepo()
+    app = Flask(__name__)
+    app.config["repo"] = repo
+
+    @app.before_request
+    def _delay():
+        if latency or jitter:
+            time.sleep(latency + random.random() * jitter)
+
+    def _content_json(path: str, content: bytes) -> dict[str, Any]:
+        return {
+            "type": "file",
+            "path": path,
+            "name": path.rsplit("/", 1)[-1],
+            "sha": blob_sha(content),
+            "size": len(content),
+            "encoding": "base64",
+            "content": base64.b64encode(content).decode("ascii"),
+        }
+
+    @app.get("/repos/<owner>/<name>/contents/<path:path>")
+    def get_contents(owner: str, name: str, path: str):
+        repo.count("gets")
+        with repo.lock:
+            content = repo.files.get(path)
+        if content is None:
+            return jsonify({"message": "Not Found"}), 404
+        etag = f'"{blob_sha(content)}"'
+        if etag in request.headers.get("If-None-Match", ""):
+            repo.count("not_modified")
+            return Response(status=304, headers={"ETag": etag})
+        resp = jsonify(_content_json(path, content))
+        resp.headers["ETag"] = etag
+        return resp
+
+    @app.put("/repos/<owner>/<name>/contents/<path:path>")
+    def put_contents(owner: str, name: str, path: str):
+        repo.count("puts")
+        body = request.get_json(silent=True) or {}
+        try:
+            content = base64.b64decode(body.get("content") or "", validate=True)
+        except ValueError:
+            return jsonify({"message": "content is not valid Base64"}), 422
+        sha = body.get("sha")
+        with repo.lock:
+            current = repo.files.get(path)
+            if current is not None and not sha:
+                repo.stats["conflicts"] += 1
+                return jsonify({"message": "Invalid request.\n\n\"sha\" wasn't supplied."}), 422
+            if current is not None and sha != blob_sha(current):
+                repo.stats["conflicts"] += 1
+                return jsonify({"message": f"{path} does not match {sha}"}), 409
+            repo.files[path] = content
+            repo.blobs[blob_sha(content)] = content
+            repo.stats["commits"] += 1
+        commit_sha = hashlib.sha1(f"{path}{time.time_ns()}".encode()).hexdigest()
+        payload = {"content": _content_json(path, content), "commit": {"sha": commit_sha, "message": body.get("message")}}
+        payload["content"].pop("content")
+        return jsonify(payload), (201 if current is None else 200)
+
+    @app.get("/repos/<owner>/<name>/git/blobs/<sha>")
+    def get_blob(owner: str, name: str, sha: str):
+        repo.count("gets")
+        with repo.lock:
+            content = repo.blobs.get(sha)
+        if content is None:
+            return jsonify({"message": "Not Found"}), 404
+        if "raw" in request.headers.get("Accept", ""):
+            return Response(content, mimetype="application/octet-stream")
+        return jsonify({"sha": sha, "size": len(content), "encoding": "base64", "content": base64.b64encode(content).decode("ascii")})
+
+    @app.get("/_stats")
+    def stats():
+        with repo.lock:
+            return jsonify(dict(repo.stats))
+
+    return app
+
+
+class _QuietHandler(WSGIRequestHandler):
+    def log_request(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+
+def serve(app: Flask, host: str = "127.0.0.1", port: int = 0) -> BaseWSGIServer:
+    """Start ``app`` on a threaded WSGI server in a daemon thread; port 0 picks a free one."""
+    server = make_server(host, port, app, threaded=True, request_handler=_QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a local GitHub contents API stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.08, help="seconds added to every request")
+    parser.add_argument("--jitter", type=float, default=0.04, help="extra random seconds, up to this much")
+    parser.add_argument("--seed", type=Path, help="file to serve as projects.json")
+    args = parser.parse_args()
+
+    repo = FakeRepo()
+    if args.seed:
+        repo.seed("projects.json", args.seed.read_bytes())
+    app = create_app(repo, args.latency, args.jitter)
+    print(f"fake GitHub API on http://{args.host}:{args.port}")
+    make_server(args.host, args.port, app, threaded=True).serve_forever()
+
+
+if __name__ == "__main__":
+    main()
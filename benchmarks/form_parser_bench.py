@@ -0,0 +1,85 @@
+"""Benchmark the shared editor form parser against the old per-request parser.
+
+Usage: python benchmarks/form_parser_bench.py [--rows 10000] [--repeat 5]
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import form_parser  # noqa: E402
+
+FIELDS = ("name", "repo", "visibility", "deploy", "desc", "sync-with-db")
+DB_FIELDS = ("id", "title", "year", "description", "image", "preview_image", "url", "category")
+SECTIONS = ("saas_completed", "saas_in_progress", "dev_tools", "fun_projects")
+
+
+def make_pairs(rows: int) -> list[tuple[str, str]]:
+    """Form pairs as a browser posts them: every row with its db-attribute panel."""
+    pairs: list[tuple[str, str]] = []
+    for i in range(rows):
+        section = SECTIONS[i % len(SECTIONS)]
+        for field in FIELDS:
+            pairs.append((f"{section}[{i}][{field}]", f"{field}-{i}"))
+        for sub in DB_FIELDS:
+            pairs.append((f"{section}[{i}][db-attribute][{sub}]", f"{sub}-{i}"))
+    pairs.append(("commit_message", "Update projects.json"))
+    return pairs
+
+
+def legacy_parse(pairs: list[tuple[str, str]]) -> dict[str, dict[str, dict[str, Any]]]:
+    # The loop previously copy-pasted into api/index.py and editor.py, including
+    # the to_dict(flat=False) copy and the per-request regex compile.
+    raw: dict[str, list[str]] = {}
+    for k, v in pairs:
+        raw.setdefault(k, []).append(v)
+    grouped: dict[str, dict[str, dict[str, Any]]] = {}
+    key_pattern = re.compile(r"([^\[]+)\[([^\]]+)\](?:\[([^\]]+)\](?:\[([^\]]+)\])?)?")
+    for full_key, values in raw.items():
+        value = values[-1] if values else ""
+        m = key_pattern.fullmatch(full_key)
+        if not m:
+            continue
+        section, idx, field, subfield = m.groups()
+        bucket = grouped.setdefault(section, {}).setdefault(idx, {})
+        if subfield:
+            bucket.setdefault(field, {})[subfield] = value
+        else:
+            bucket[field] = value
+    return grouped
+
+
+def _best_of(fn: Any, arg: Any, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark editor form parsing")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    pairs = make_pairs(args.rows)
+    if legacy_parse(pairs) != form_parser.parse_pairs(pairs):
+        raise SystemExit("parsers disagree")
+
+    print(f"{args.rows} rows, {len(pairs)} fields, best of {args.repeat}")
+    legacy = _best_of(legacy_parse, pairs, args.repeat)
+    shared = _best_of(form_parser.parse_pairs, pairs, args.repeat)
+    print(f"  legacy  {legacy * 1000:8.1f} ms")
+    print(f"  shared  {shared * 1000:8.1f} ms  ({legacy / shared:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
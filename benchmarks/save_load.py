@@ -0,0 +1,188 @@
+"""Concurrent save load test for api/index.py against the fake GitHub API.
+
+Starts benchmarks.fake_github and the editor app on real threaded WSGI servers,
+then runs N editors that each save M times, either through the full-form
+POST /api/editor/save or the row-level PATCH /api/editor/rows. Reports
+saves/sec, latency percentiles and how often GitHub rejected a stale sha.
+
+Usage: python -m benchmarks.save_load [--editors 8] [--saves 10] [--mode save|patch]
+                                      [--rows 200] [--latency 0.08] [--jitter 0.04]
+
+The app writes its working copy to /tmp/projects.json; any existing file there
+is restored afterwards.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import requests
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "api"))
+
+from benchmarks.fake_github import FakeRepo, create_app, serve  # noqa: E402
+from benchmarks.suite import form_pairs  # noqa: E402
+from benchmarks.synthetic import generate  # noqa: E402
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(pct / 100 * len(ordered))) - 1]
+
+
+_HIDDEN = re.compile(r'name="(base_version|base_sha)" value="([^"]*)"')
+
+
+def _load_editor(http: requests.Session, base_url: str, sections: list[str]) -> tuple[str, dict[str, list[dict[str, Any]]]]:
+    """What a browser holds after loading the editor: the page's base sha and every row."""
+    while True:
+        page = http.get(f"{base_url}/api/editor", params={"paged": "1"})
+        hidden = dict(_HIDDEN.findall(page.text))
+        document: dict[str, list[dict[str, Any]]] = {}
+        consistent = True
+        for section in sections:
+            rows: list[dict[str, Any]] = []
+            pages, n = 1, 1
+            while n <= pages:
+                body = http.get(
+                    f"{base_url}/api/editor/rows", params={"section": section, "page": n, "per_page": 500}
+                ).json()
+                consistent &= body.get("version") == hidden.get("base_version")
+                rows.extend(body.get("rows") or [])
+                pages, n = body.get("pages", 1), n + 1
+            document[section] = rows
+        if consistent:
+            return hidden.get("base_sha", ""), document
+
+
+def _editor(
+    base_url: str,
+    editor: int,
+    saves: int,
+    mode: str,
+    document: dict[str, list[dict[str, Any]]],
+    latencies: list[float],
+    outcomes: dict[str, int],
+    lock: threading.Lock,
+) -> None:
+    http = requests.Session()
+    http.post(f"{base_url}/api/login", json={}).raise_for_status()
+    section = next(iter(document))
+    row = document[section][editor % len(document[section])]
+    base = http.get(f"{base_url}/api/editor/rows", params={"section": section}).json().get("version")
+    for n in range(saves):
+        desc = f"editor {editor} save {n}"
+        started = time.perf_counter()
+        if mode == "patch":
+            op = {"op": "update", "section": section, "name": row["name"], "row": {**row, "desc": desc}}
+            r = http.patch(f"{base_url}/api/editor/rows", json={"base": base, "message": desc, "ops": [op]})
+            if r.status_code == 409:
+                # Someone saved first; rebase on their version and retry once, like the editor UI
+                with lock:
+                    outcomes["stale_base"] += 1
+                base = r.json().get("version")
+                r = http.patch(f"{base_url}/api/editor/rows", json={"base": base, "message": desc, "ops": [op]})
+            ok = r.status_code == 200
+            base = (r.json() or {}).get("version") or base
+        else:
+            # Reload the page after every save, as the redirect does in a browser
+            base_sha, edited = _load_editor(http, base_url, list(document))
+            edited[section][editor % len(edited[section])]["desc"] = desc
+            data = form_pairs(edited)[:-1] + [("commit_message", desc), ("base_sha", base_sha)]
+            started = time.perf_counter()
+            r = http.post(f"{base_url}/api/editor/save", data=data, allow_redirects=False)
+            ok = r.status_code == 302
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+            outcomes["ok" if ok else "failed"] += 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test concurrent editor saves")
+    parser.add_argument("--editors", type=int, default=8)
+    parser.add_argument("--saves", type=int, default=10, help="saves per editor")
+    parser.add_argument("--mode", choices=("save", "patch"), default="save")
+    parser.add_argument("--rows", type=int, default=200, help="rows in the synthetic projects.json")
+    parser.add_argument("--latency", type=float, default=0.08)
+    parser.add_argument("--jitter", type=float, default=0.04)
+    args = parser.parse_args()
+
+    document = generate(args.rows)
+    seed = json.dumps(document, indent=2).encode("utf-8")
+    repo = FakeRepo()
+    repo.seed("projects.json", seed)
+    github = serve(create_app(repo, args.latency, args.jitter))
+
+    # api/index.py reads its settings at import time
+    os.environ.update({
+        "GITHUB_API_URL": f"http://127.0.0.1:{github.server_port}",
+        "GITHUB_TOKEN": "fake-token",
+        "GITHUB_REPO": "bench/projects",
+        "GITHUB_COMMIT_MODE": "contents",
+        "EDITOR_PASSWORD": "",
+        "LATENCY_LOG": str(Path(tempfile.gettempdir()) / "save-load-requests.jsonl"),
+    })
+    os.environ.pop("NEON_DATABASE_URL", None)
+    import index  # noqa: E402
+
+    backup = index.TMP_DATA.read_bytes() if index.TMP_DATA.exists() else None
+    index.TMP_DATA.write_bytes(seed)
+    app_server = serve(index.app)
+    base_url = f"http://127.0.0.1:{app_server.server_port}"
+
+    latencies: list[float] = []
+    outcomes = {"ok": 0, "failed": 0, "stale_base": 0}
+    lock = threading.Lock()
+    threads = [
+        threading.Thread(target=_editor, args=(base_url, i, args.saves, args.mode, document, latencies, outcomes, lock))
+        for i in range(args.editors)
+    ]
+    started = time.perf_counter()
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        wall = time.perf_counter() - started
+        app_server.shutdown()
+        github.shutdown()
+        if backup is None:
+            index.TMP_DATA.unlink(missing_ok=True)
+        else:
+            index.TMP_DATA.write_bytes(backup)
+
+    stats = repo.stats
+    total = outcomes["ok"] + outcomes["failed"]
+    if args.mode == "save":
+        # The form save always redirects; a save that lost its commit shows up as a missing PUT
+        outcomes["failed"] = max(outcomes["failed"], total - stats["commits"])
+    print(f"{args.editors} editors x {args.saves} saves ({args.mode}), {args.rows} rows, "
+          f"GitHub latency {args.latency * 1000:.0f}+{args.jitter * 1000:.0f} ms")
+    print(f"  saves/sec         {total / wall:8.2f}  ({total} in {wall:.1f}s)")
+    print(f"  latency p50       {_percentile(latencies, 50) * 1000:8.1f} ms")
+    print(f"  latency p95       {_percentile(latencies, 95) * 1000:8.1f} ms")
+    print(f"  latency max       {max(latencies, default=0) * 1000:8.1f} ms")
+    print(f"  failed saves      {outcomes['failed']:8d}")
+    if args.mode == "patch":
+        print(f"  stale-base 409s   {outcomes['stale_base']:8d}")
+    print(f"  GitHub PUTs       {stats['puts']:8d}  ({stats['commits']} commits)")
+    print(f"  conflict rate     {stats['conflicts'] / max(1, stats['puts']):8.1%}  ({stats['conflicts']} stale-sha rejections)")
+
+
+if __name__ == "__main__":
+    main()
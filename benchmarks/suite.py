@@ -0,0 +1,198 @@
+"""Time the hot paths over synthetic documents and compare against a baseline.
+
+Usage:
+    python -m benchmarks.suite [--sizes 100 1000 10000] [--repeat 5]
+                               [--output results.json] [--baseline baseline.json]
+                               [--threshold 0.25] [--save-baseline]
+
+Results are written as JSON keyed by ``case@rows``. With ``--baseline`` the run
+exits non-zero if any case's best time is more than ``threshold`` slower than
+the stored one; ``--save-baseline`` writes this run as the new baseline instead.
+"""
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "api"))
+
+import form_parser  # noqa: E402
+import generate_readme  # noqa: E402
+import sync_neon_db  # noqa: E402
+
+from benchmarks.synthetic import generate  # noqa: E402
+
+DEFAULT_SIZES = (100, 1_000, 10_000)
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+
+
+def form_pairs(document: dict[str, list[dict[str, Any]]]) -> list[tuple[str, str]]:
+    """The (key, value) pairs a browser posts for ``document`` from the full editor."""
+    pairs: list[tuple[str, str]] = []
+    for section, rows in document.items():
+        for i, row in enumerate(rows):
+            for field in ("name", "repo", "visibility", "deploy", "desc"):
+                pairs.append((f"{section}[{i}][{field}]", row.get(field) or ""))
+            if row.get("sync-with-db"):
+                pairs.append((f"{section}[{i}][sync-with-db]", "on"))
+            for sub, value in (row.get("db-attribute") or {}).items():
+                pairs.append((f"{section}[{i}][db-attribute][{sub}]", value or ""))
+    pairs.append(("commit_message", "Update projects.json"))
+    return pairs
+
+
+def _time(fn: Callable[[], Any], repeat: int, setup: Callable[[], Any] | None = None) -> dict[str, float]:
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return {"best_ms": round(min(samples), 3), "median_ms": round(statistics.median(samples), 3)}
+
+
+def _readme_blocks(document: dict[str, list[dict[str, Any]]]) -> str:
+    """A README with one generated block per section, like the real readme.md."""
+    parts = []
+    for section in document:
+        key = section.upper()
+        parts.append(
+            f"<!-- GENERATED: {key} START (edit in LungWai/projects.json) -->\n"
+            f"        <!-- GENERATED: {key} END -->"
+        )
+    return "# Projects\n\n" + "\n\n".join(parts) + "\n"
+
+
+def run_size(rows: int, repeat: int, workdir: Path) -> dict[str, dict[str, float]]:
+    import index  # api/index.py; imported late so its env settings are read once
+
+    document = generate(rows)
+    pairs = form_pairs(document)
+    grouped = form_parser.parse_pairs(pairs)
+    first = next(iter(document))
+    readme = _readme_blocks(document)
+    rendered_first = generate_readme.render_section(document[first])
+
+    data_path = workdir / f"projects-{rows}.json"
+    readme_path = workdir / f"readme-{rows}.md"
+    data_path.write_text(json.dumps(document, indent=2), encoding="utf-8")
+    readme_path.write_text(readme, encoding="utf-8")
+
+    def readme_main() -> None:
+        generate_readme.DATA, generate_readme.README = data_path, readme_path
+        with contextlib.redirect_stdout(io.StringIO()):
+            generate_readme.main()
+
+    def cold_readme() -> None:
+        # Measure a full render, not the per-section memo hit
+        generate_readme._RENDERED.clear()
+        readme_path.write_text(readme, encoding="utf-8")
+
+    rows_flat = sync_neon_db._collect_projects(document)
+    gh = index._gh_status_base()
+
+    def render_template(paged: bool) -> Callable[[], str]:
+        def _render() -> str:
+            with index.app.test_request_context("/api/editor"):
+                return index.render_template(
+                    index.EDITOR_TEMPLATE,
+                    data=document, gh=gh, version="bench", paged=paged, page_size=index.EDITOR_PAGE_SIZE,
+                )
+        return _render
+
+    cases: dict[str, tuple[Callable[[], Any], Callable[[], Any] | None]] = {
+        "form_parser.parse_pairs": (lambda: form_parser.parse_pairs(pairs), None),
+        "index.normalize": (lambda: [index.normalize(r) for r in grouped.values()], None),
+        "generate_readme.render_section": (lambda: [generate_readme.render_section(v) for v in document.values()], None),
+        "generate_readme.replace_block": (
+            lambda: generate_readme.replace_block(readme, first.upper(), rendered_first), None,
+        ),
+        "generate_readme.main": (readme_main, cold_readme),
+        "sync_neon_db._project_to_product": (lambda: [sync_neon_db._project_to_product(r) for r in rows_flat], None),
+        "sync_neon_db._prepare_records": (lambda: sync_neon_db._prepare_records(document), None),
+        "editor_template.full": (render_template(False), None),
+        "editor_template.paged": (render_template(True), None),
+    }
+    results = {}
+    for name, (fn, setup) in cases.items():
+        results[f"{name}@{rows}"] = _time(fn, repeat, setup)
+        print(f"  {name:<36}{rows:>8} rows {results[f'{name}@{rows}']['best_ms']:>12.2f} ms")
+    return results
+
+
+def compare(results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]], threshold: float) -> list[str]:
+    """Return one message per case that regressed beyond ``threshold`` (0.25 = 25% slower)."""
+    regressions = []
+    for key, current in sorted(results.items()):
+        previous = baseline.get(key)
+        if not previous or previous.get("best_ms", 0) <= 0:
+            continue
+        ratio = current["best_ms"] / previous["best_ms"]
+        if ratio > 1 + threshold:
+            regressions.append(f"{key}: {previous['best_ms']:.2f} ms -> {current['best_ms']:.2f} ms ({ratio:.2f}x)")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the micro-benchmark suite")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", type=Path, help="write results JSON here")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown vs baseline")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="projects-bench-"))
+    results: dict[str, dict[str, float]] = {}
+    try:
+        for rows in args.sizes:
+            print(f"{rows} rows, best of {args.repeat}")
+            results.update(run_size(rows, args.repeat, workdir))
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.time(),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"baseline saved to {args.baseline}")
+        return
+    if not args.baseline.exists():
+        print(f"no baseline at {args.baseline}; run with --save-baseline to create one")
+        return
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8")).get("results", {})
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+        for line in regressions:
+            print(f"  {line}")
+        raise SystemExit(1)
+    print(f"\nno regressions beyond {args.threshold:.0%} vs {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Generate synthetic projects.json documents of a given size.
+
+Usage: python -m benchmarks.synthetic [--rows 100 1000 10000 100000] [--out DIR]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+from pathlib import Path
+from typing import Any
+
+SECTIONS = ("saas_completed", "saas_in_progress", "dev_tools", "fun_projects")
+SIZES = (100, 1_000, 10_000, 100_000)
+CATEGORIES = ("Development Tools", "Productivity", "AI", "Education", "Games", "Finance")
+WORDS = (
+    "automated platform repository workflow pipeline dashboard realtime analytics "
+    "editor sync deploy cloud native lightweight open source toolkit generator "
+    "service api client data visual interactive secure fast"
+).split()
+
+
+def _sentence(rng: random.Random, lo: int, hi: int) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(lo, hi))]
+    return " ".join(words).capitalize()
+
+
+def make_row(i: int, rng: random.Random) -> dict[str, Any]:
+    """One project row; roughly a third carry a db-attribute panel like the real file."""
+    name = f"project-{i:06d}"
+    row: dict[str, Any] = {
+        "name": name,
+        "repo": f"https://github.com/example/{name}",
+        "visibility": rng.choice(("public", "private")),
+        "deploy": f"{name}.example.com" if rng.random() < 0.6 else None,
+        "desc": _sentence(rng, 6, 14),
+        "sync-with-db": rng.random() < 0.35,
+    }
+    if row["sync-with-db"]:
+        row["db-attribute"] = {
+            "id": f"product-{i}",
+            "title": name.replace("-", " ").title(),
+            "year": f"{rng.randint(2019, 2025)} Q{rng.randint(1, 4)}",
+            "description": _sentence(rng, 20, 40) + ".",
+            "image": f"/logos/{name}.svg",
+            "preview_image": f"https://img.example.com/file/{rng.getrandbits(40)}_{name}.png",
+            "url": f"https://{name}.example.com/",
+            "category": rng.choice(CATEGORIES),
+        }
+    return row
+
+
+def generate(rows: int, seed: int = 0) -> dict[str, list[dict[str, Any]]]:
+    """A projects.json document with ``rows`` rows spread over the four sections."""
+    rng = random.Random(seed)
+    document: dict[str, list[dict[str, Any]]] = {s: [] for s in SECTIONS}
+    for i in range(rows):
+        document[SECTIONS[i % len(SECTIONS)]].append(make_row(i, rng))
+    return document
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write synthetic projects.json files")
+    parser.add_argument("--rows", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--out", type=Path, default=Path("/tmp/projects-bench"))
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    args.out.mkdir(parents=True, exist_ok=True)
+    for rows in args.rows:
+        path = args.out / f"projects-{rows}.json"
+        path.write_text(json.dumps(generate(rows, args.seed), indent=2), encoding="utf-8")
+        print(f"wrote {path} ({path.stat().st_size / 1024:.0f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Build static JSON artifacts from projects.json for the CDN.
+
+Writes into ``data/`` (served as plain files next to index.html):
+
+    projects.<hash>.json            the whole document, minified
+    sections/<section>.<hash>.json  one shard per section
+    products.<hash>.json            rows as they sync to the products table
+    manifest.json                   logical name -> hashed file, size and sha256
+
+Every artifact gets a ``.gz`` sibling, and a ``.br`` one when brotli is
+installed. File names carry a content hash, so they can be cached forever and
+only manifest.json needs revalidating. Files from the previous build that the
+new manifest no longer lists are removed.
+
+Usage: python build_static.py [--out data] [--projects projects.json]
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Any
+
+import precompress
+import projects_cache
+import sync_neon_db
+
+ROOT = Path(__file__).parent
+DATA = ROOT / "projects.json"
+OUT = ROOT / "data"
+MANIFEST = "manifest.json"
+
+HASH_LENGTH = 12
+SUFFIXES = {"gzip": ".gz", "br": ".br"}
+_SAFE_NAME = re.compile(r"[A-Za-z0-9_-]+")
+
+
+def minify(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def products(document: dict[str, Any]) -> list[dict[str, Any]]:
+    """Synced rows in the products table shape.
+
+    Timestamps come from the db_products.json mirror; rows it does not have yet,
+    or has with different content, get null ones so a rebuild gives the same bytes.
+    """
+    records = [{**r, "created_at": None, "updated_at": None} for r in sync_neon_db._prepare_records(document)]
+    return sync_neon_db._mirror_rows(records, sync_neon_db._load_json_mirror())
+
+
+def artifacts(document: dict[str, Any]) -> dict[str, bytes]:
+    """Logical name -> minified body for everything the build publishes."""
+    out = {"projects.json": minify(document)}
+    for section, rows in projects_cache.filter_sections(document).items():
+        if not _SAFE_NAME.fullmatch(section):
+            print(f"Warning: skipping section {section!r}, not usable as a file name")
+            continue
+        out[f"sections/{section}.json"] = minify(rows)
+    out["products.json"] = minify(products(document))
+    return out
+
+
+def hashed_name(logical: str, raw: bytes) -> str:
+    stem, ext = os.path.splitext(logical)
+    return f"{stem}.{hashlib.sha256(raw).hexdigest()[:HASH_LENGTH]}{ext}"
+
+
+def _listed_files(manifest: dict[str, Any]) -> set[str]:
+    files: set[str] = set()
+    for entry in (manifest.get("files") or {}).values():
+        files.add(entry["path"])
+        files.update(v["path"] for v in (entry.get("encodings") or {}).values())
+    return files
+
+
+def build(document: dict[str, Any], out: Path, version: str = "") -> dict[str, Any]:
+    """Write every artifact under ``out`` and return the manifest.
+
+    Hashed files are only written when missing, since an existing name already
+    has the right bytes. The manifest goes last so it never points at a file
+    that is not there yet.
+    """
+    manifest_path = out / MANIFEST
+    try:
+        previous = json.loads(manifest_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        previous = {}
+
+    files: dict[str, Any] = {}
+    for logical, raw in artifacts(document).items():
+        name = hashed_name(logical, raw)
+        entry: dict[str, Any] = {
+            "path": name,
+            "bytes": len(raw),
+            "sha256": hashlib.sha256(raw).hexdigest(),
+            "encodings": {},
+        }
+        bodies = {name: raw}
+        for encoding, body in precompress.variants(raw).items():
+            path = name + SUFFIXES[encoding]
+            entry["encodings"][encoding] = {"path": path, "bytes": len(body)}
+            bodies[path] = body
+        for path, body in bodies.items():
+            if not (out / path).exists():
+                projects_cache.write_atomic(out / path, body)
+        files[logical] = entry
+
+    manifest = {"version": version, "files": files}
+    projects_cache.write_atomic(manifest_path, (json.dumps(manifest, indent=2) + "\n").encode("utf-8"))
+
+    for stale in _listed_files(previous) - _listed_files(manifest):
+        try:
+            (out / stale).unlink()
+        except FileNotFoundError:
+            pass
+    return manifest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build minified, precompressed JSON artifacts from projects.json")
+    parser.add_argument("--projects", type=Path, default=DATA, help="projects.json to build from")
+    parser.add_argument("--out", type=Path, default=OUT, help=f"output directory (default: {OUT})")
+    args = parser.parse_args()
+
+    snap = projects_cache.load(args.projects)
+    manifest = build(snap.document, args.out, snap.version)
+    for logical, entry in manifest["files"].items():
+        sizes = ", ".join(f"{enc} {v['bytes']}" for enc, v in entry["encodings"].items())
+        print(f"{entry['path']}: {entry['bytes']} bytes ({sizes})")
+    print(f"Wrote {len(manifest['files'])} artifacts and {MANIFEST} to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,29 @@
 from __future__ import annotations
 
-import json
+import threading
 from pathlib import Path
 from typing import Any
 
-from flask import Flask, render_template_string, request, redirect, url_for, flash
+from flask import Flask, render_template_string, request, redirect, url_for, flash, jsonify
+
+import form_parser
+import jobs
+import projects_cache
+import stage_log
 
 ROOT = Path(__file__).parent
 DATA = ROOT / "projects.json"
 README = ROOT / "readme.md"
 
+# README regeneration runs one at a time: queued jobs coalesce into the one not
+# started yet, and commit() takes the lock so it never races a running job
+_readme_lock = threading.Lock()
+_readme_queued: str | None = None
+_readme_queued_lock = threading.Lock()
+
 app = Flask(__name__)
 app.secret_key = "dev-key"
+stage_log.install(app)
 
 TEMPLATE = """
 <!doctype html>
@@ -306,7 +318,8 @@ document.querySelectorAll('tbody tr').forEach(function(tr){ if(!tr.classList.con
 
 
 def load_data() -> dict[str, list[dict[str, Any]]]:
-    return json.loads(DATA.read_text(encoding="utf-8"))
+    # Shared, read-only parsed document; re-parsed only when projects.json changes
+    return projects_cache.load(DATA).document
 
 
 def _looks_like_github_slug(s: str) -> bool:
@@ -366,35 +379,38 @@ def normalize(rows: dict[str, dict[str, Any]]) -> list[dict[str, Any]]:
     return cleaned
 
 
+def _regenerate_readme() -> None:
+    import generate_readme  # type: ignore
+    with _readme_lock:
+        generate_readme.main()
+
+
+def _readme_job() -> None:
+    global _readme_queued
+    with _readme_queued_lock:
+        _readme_queued = None
+    _regenerate_readme()
+
+
+def _queue_readme() -> str:
+    """Queue a README regeneration, or return the id of one still waiting to start."""
+    global _readme_queued
+    with _readme_queued_lock:
+        if _readme_queued is None:
+            _readme_queued = jobs.submit("readme", _readme_job)
+        return _readme_queued
+
+
 @app.get("/")
 def index():
-    data = load_data()
-    visible_data = {k: v for k, v in data.items() if isinstance(v, list) and all(isinstance(r, dict) for r in v)}
+    visible_data = projects_cache.load(DATA).sections
     return render_template_string(TEMPLATE, data=visible_data)
 
 
 @app.post("/save")
 def save():
-    raw = request.form.to_dict(flat=False)
-    grouped: dict[str, dict[str, dict[str, Any]]] = {}
     # Parse keys like section[idx][field] and nested section[idx][db-attribute][field]
-    import re as _re
-    key_pattern = _re.compile(r"([^\[]+)\[([^\]]+)\](?:\[([^\]]+)\](?:\[([^\]]+)\])?)?")
-    for full_key, values in raw.items():
-        value = values[-1] if values else ""
-        m = key_pattern.fullmatch(full_key)
-        if not m:
-            continue
-        section, idx, field, subfield = m.groups()
-        bucket = grouped.setdefault(section, {}).setdefault(idx, {})
-        if subfield:
-            bucket.setdefault(field, {})[subfield] = value
-        else:
-            bucket[field] = value
-
-    data: dict[str, list[dict[str, Any]]] = {}
-    for section, rows in grouped.items():
-        data[section] = normalize(rows)
+    data = form_parser.parse_sections(request.form, normalize)
 
     # Preserve any non-list metadata keys from the original file
     try:
@@ -405,13 +421,12 @@ def save():
     except Exception:
         pass
 
-    DATA.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    projects_cache.store(DATA, data)
 
-    # Regenerate README by importing and calling the generator
+    # Regenerate README out of band; it re-reads projects.json, so retries are safe
     try:
-        import generate_readme  # type: ignore
-        generate_readme.main()
-        flash("Saved and regenerated README.")
+        job_id = _queue_readme()
+        flash(f"Saved projects.json; README regeneration queued (job {job_id}).")
     except Exception as exc:  # pragma: no cover
         flash(f"Saved projects.json but failed to regenerate README: {exc}")
 
@@ -419,6 +434,11 @@ def save():
 
 
 def _git_commit_and_push() -> tuple[bool, str]:
+    with stage_log.stage("git_push"):
+        return _run_git_commit_and_push()
+
+
+def _run_git_commit_and_push() -> tuple[bool, str]:
     import subprocess, os
     try:
         add = subprocess.run(["git", "-C", str(ROOT), "add", "-A"], capture_output=True, text=True)
@@ -443,25 +463,7 @@ def _git_commit_and_push() -> tuple[bool, str]:
 
 @app.post("/commit")
 def commit():
-    raw = request.form.to_dict(flat=False)
-    grouped: dict[str, dict[str, dict[str, Any]]] = {}
-    import re as _re
-    key_pattern = _re.compile(r"([^\[]+)\[([^\]]+)\](?:\[([^\]]+)\](?:\[([^\]]+)\])?)?")
-    for full_key, values in raw.items():
-        value = values[-1] if values else ""
-        m = key_pattern.fullmatch(full_key)
-        if not m:
-            continue
-        section, idx, field, subfield = m.groups()
-        bucket = grouped.setdefault(section, {}).setdefault(idx, {})
-        if subfield:
-            bucket.setdefault(field, {})[subfield] = value
-        else:
-            bucket[field] = value
-
-    data: dict[str, list[dict[str, Any]]] = {}
-    for section, rows in grouped.items():
-        data[section] = normalize(rows)
+    data = form_parser.parse_sections(request.form, normalize)
 
     try:
         original = load_data()
@@ -471,29 +473,40 @@ def commit():
     except Exception:
         pass
 
-    DATA.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    projects_cache.store(DATA, data)
 
     try:
-        import generate_readme  # type: ignore
-        generate_readme.main()
+        # Waits for a README job already running; a queued one rewrites the same bytes
+        _regenerate_readme()
         flash("Saved and regenerated README.")
     except Exception as exc:  # pragma: no cover
         flash(f"Saved projects.json but failed to regenerate README: {exc}")
 
+    # The sync may fall back to writing the db_products.json mirror, which the
+    # commit must include, so it finishes before `git add` runs
+    import sync_neon_db  # type: ignore
     try:
-        import sync_neon_db  # type: ignore
         if sync_neon_db.sync_from_env(strict=False):
-            flash("Neon DB sync attempted.")
+            flash("Neon DB synced.")
         else:
             flash("Neon DB not configured; mirrored to JSON or CI will sync.")
     except Exception as exc:  # pragma: no cover
         flash(f"Neon DB sync error: {exc}")
 
-    ok, msg = _git_commit_and_push()
+    _ok, msg = _git_commit_and_push()
     flash(msg)
 
     return redirect(url_for("index"))
 
+
+@app.get("/jobs/<job_id>")
+def job_status(job_id: str):
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"ok": False, "error": "unknown job"}), 404
+    return jsonify({"ok": True, "job": job})
+
+
 if __name__ == "__main__":
     app.run(host="127.0.0.1", port=5000, debug=True)
 
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import re
+from typing import Any, Callable, Iterable
+
+from stage_log import stage
+
+# Keys look like section[idx][field] or section[idx][db-attribute][subfield]
+KEY_PATTERN = re.compile(r"([^\[]+)\[([^\]]+)\](?:\[([^\]]+)\](?:\[([^\]]+)\])?)?")
+
+Rows = dict[str, dict[str, Any]]
+
+
+def parse_pairs(pairs: Iterable[tuple[str, str]]) -> dict[str, Rows]:
+    """Group ``(key, value)`` form pairs into ``{section: {idx: row}}`` in one pass.
+
+    Repeated keys keep the last value, like ``values[-1]`` over ``to_dict(flat=False)``.
+    Keys that are not ``section[idx][field]`` shaped (e.g. ``commit_message``) are skipped.
+    """
+    grouped: dict[str, Rows] = {}
+    match = KEY_PATTERN.fullmatch
+    current: tuple[str, str] | None = None
+    row: dict[str, Any] = {}
+    for full_key, value in pairs:
+        m = match(full_key)
+        if m is None:
+            continue
+        section, idx, field, subfield = m.groups()
+        if field is None:
+            continue
+        # Browsers submit a row's fields together, so the row lookup is usually cached
+        if current != (section, idx):
+            rows = grouped.get(section)
+            if rows is None:
+                rows = grouped[section] = {}
+            row = rows.get(idx)
+            if row is None:
+                row = rows[idx] = {}
+            current = (section, idx)
+        if subfield is None:
+            row[field] = value
+        else:
+            nested = row.get(field)
+            if not isinstance(nested, dict):
+                nested = row[field] = {}
+            nested[subfield] = value
+    return grouped
+
+
+def parse_form(form: Any) -> dict[str, Rows]:
+    """Parse a werkzeug ``MultiDict`` (e.g. ``request.form``) without copying it first."""
+    return parse_pairs(form.items(multi=True))
+
+
+def parse_sections(form: Any, normalize: Callable[[Rows], list[dict[str, Any]]]) -> dict[str, list[dict[str, Any]]]:
+    """Parse a submitted editor form and normalize every section's rows."""
+    with stage("form_parse"):
+        grouped = parse_form(form)
+    with stage("normalize"):
+        return {section: normalize(rows) for section, rows in grouped.items()}
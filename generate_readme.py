@@ -1,11 +1,24 @@
+import hashlib
 import json
 import re
 from pathlib import Path
 
+import projects_cache
+from stage_log import stage
+
 ROOT = Path(__file__).parent
 README = ROOT / "readme.md"
 DATA = ROOT / "projects.json"
 
+# Any GENERATED block; the key names the projects.json section it renders (upper-cased)
+BLOCK_RE = re.compile(
+    r"(?P<start><!-- GENERATED: (?P<key>[A-Za-z0-9_]+) START[^>]*-->)(?P<body>.*?)(?P<end><!-- GENERATED: (?P=key) END -->)",
+    re.DOTALL,
+)
+
+# Per-section render memo: block key -> (input digest, rendered rows)
+_RENDERED: dict[str, tuple[str, str]] = {}
+
 VIS_ICON = {
     "public": "🌐 Public",
     "private": "🔒 Private",
@@ -72,21 +85,54 @@ def replace_block(text: str, key: str, replacement: str) -> str:
 
 
 
-def main() -> None:
-    data = json.loads(DATA.read_text(encoding="utf-8"))
+def _section_blocks(data: dict) -> dict[str, str]:
+    """Render every list-of-dict section, re-rendering only sections whose input changed."""
+    blocks: dict[str, str] = {}
+    for section, items in data.items():
+        if not (isinstance(items, list) and all(isinstance(p, dict) for p in items)):
+            continue
+        key = section.upper()
+        digest = hashlib.sha256(json.dumps(items, sort_keys=True).encode("utf-8")).hexdigest()
+        cached = _RENDERED.get(key)
+        if cached is None or cached[0] != digest:
+            cached = (digest, render_section(items))
+            _RENDERED[key] = cached
+        blocks[key] = cached[1]
+    return blocks
+
+
+def render_readme(data: dict, md: str) -> str:
+    """Return ``md`` with every generated block re-rendered from ``data`` in one scan.
+
+    Blocks without a matching projects.json section are left untouched.
+    """
+    with stage("readme_render"):
+        return _render(data, md)
 
-    saas_completed = render_section(data.get("saas_completed", []))
-    saas_in_progress = render_section(data.get("saas_in_progress", []))
-    dev_tools = render_section(data.get("dev_tools", []))
-    fun_projects = render_section(data.get("fun_projects", []))
 
-    md = README.read_text(encoding="utf-8")
-    md = replace_block(md, "SAAS_COMPLETED", saas_completed)
-    md = replace_block(md, "SAAS_IN_PROGRESS", saas_in_progress)
-    md = replace_block(md, "DEV_TOOLS", dev_tools)
-    md = replace_block(md, "FUN_PROJECTS", fun_projects)
+def _render(data: dict, md: str) -> str:
+    blocks = _section_blocks(data)
+
+    def _sub(m: re.Match) -> str:
+        rendered = blocks.get(m.group("key"))
+        if rendered is None:
+            return m.group(0)
+        return f"{m.group('start')}\n{rendered}\n        {m.group('end')}"
+
+    return BLOCK_RE.sub(_sub, md)
+
+
+def main() -> None:
+    data = projects_cache.load(DATA).document
+
+    current = README.read_bytes()
+    md = render_readme(data, current.decode("utf-8")).encode("utf-8")
 
-    README.write_text(md, encoding="utf-8")
+    # Leave the file (and its mtime) alone when nothing changed, so CI sees no diff
+    if md == current:
+        print("README already up to date")
+        return
+    projects_cache.write_atomic(README, md)
     print("README updated from projects.json")
 
 
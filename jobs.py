@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import time
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable
+
+import projects_cache
+
+# Out-of-band work (Neon sync, README regeneration) runs on a small thread pool so
+# HTTP responses do not wait for it. Each job's status is persisted as JSON under
+# JOBS_DIR, so any request served by the same instance can poll it.
+JOBS_DIR = Path(os.getenv("JOBS_DIR", "/tmp/editor-jobs"))
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_RETRY_DELAY = float(os.getenv("JOB_RETRY_DELAY", "2"))
+
+_JOB_ID = re.compile(r"[0-9a-f]{32}")
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _pool() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=max(1, JOB_WORKERS), thread_name_prefix="job")
+        return _executor
+
+
+def _path(job_id: str) -> Path:
+    return JOBS_DIR / f"{job_id}.json"
+
+
+def _write(job: dict[str, Any]) -> None:
+    projects_cache.write_atomic(_path(job["id"]), json.dumps(job).encode("utf-8"))
+
+
+def _update(job: dict[str, Any], **changes: Any) -> None:
+    job.update(changes, updated_at=time.time())
+    _write(job)
+
+
+def get(job_id: str) -> dict[str, Any] | None:
+    if not _JOB_ID.fullmatch(job_id or ""):
+        return None
+    try:
+        return json.loads(_path(job_id).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _run(job: dict[str, Any], fn: Callable[[], Any]) -> None:
+    for attempt in range(1, job["max_attempts"] + 1):
+        _update(job, status="running", attempts=attempt)
+        try:
+            result = fn()
+        except Exception as exc:
+            error = f"{exc.__class__.__name__}: {exc}"
+            if attempt >= job["max_attempts"]:
+                _update(job, status="failed", error=error, trace=traceback.format_exc(limit=5))
+                return
+            _update(job, status="retrying", error=error)
+            time.sleep(JOB_RETRY_DELAY * 2 ** (attempt - 1))
+            continue
+        _update(job, status="succeeded", result=result, error=None)
+        return
+
+
+def submit(kind: str, fn: Callable[[], Any], *, max_attempts: int | None = None) -> str:
+    """Queue ``fn`` and return its job id.
+
+    Failed attempts are retried with exponential backoff, so ``fn`` must be
+    idempotent. Its return value must be JSON serializable.
+    """
+    job = {
+        "id": uuid.uuid4().hex,
+        "kind": kind,
+        "status": "queued",
+        "attempts": 0,
+        "max_attempts": max(1, max_attempts or JOB_MAX_ATTEMPTS),
+        "created_at": time.time(),
+        "updated_at": time.time(),
+        "result": None,
+        "error": None,
+    }
+    _write(job)
+    _pool().submit(_run, job, fn)
+    return job["id"]
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import gzip
+from typing import Any
+
+# Brotli is optional: without it only gzip variants are produced
+try:
+    import brotli  # type: ignore
+except ImportError:  # pragma: no cover - depends on the environment
+    try:
+        import brotlicffi as brotli  # type: ignore
+    except ImportError:
+        brotli = None
+
+# Preferred first when a client accepts several
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def variants(raw: bytes) -> dict[str, bytes]:
+    """``raw`` compressed once per supported encoding, at the highest levels.
+
+    Meant for bodies that are built once and served many times, so the slow
+    settings pay off. gzip output carries no timestamp, so equal input gives
+    equal bytes.
+    """
+    out = {"gzip": gzip.compress(raw, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        out["br"] = brotli.compress(raw, quality=11)
+    return out
+
+
+def negotiate(accept_encodings: Any, available: dict[str, bytes]) -> str | None:
+    """The best encoding in ``available`` the client accepts, or None for identity.
+
+    ``accept_encodings`` is werkzeug's ``request.accept_encodings``.
+    """
+    for encoding in ENCODINGS:
+        if encoding in available and accept_encodings[encoding] > 0:
+            return encoding
+    return None
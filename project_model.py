@@ -0,0 +1,130 @@
+"""An indexed view of projects.json.
+
+``build`` walks the document once and indexes every row by name, by normalized
+repo URL and by the products table id it syncs to, so lookups never scan the
+sections. Rows that share a key are collected in ``duplicates``; ``strict``
+rejects them instead. A shared name or repo resolves to the first row; a shared
+product id resolves to the row the sync leaves in the products table.
+
+Run ``python project_model.py [projects.json]`` to list duplicates (exit 1 if any).
+"""
+from __future__ import annotations
+
+import sys
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import projects_cache
+from reconcile import repo_key
+from sync_neon_db import SECTIONS, product_id
+
+
+@dataclass(frozen=True)
+class ProjectRef:
+    section: str
+    index: int
+    row: dict[str, Any]
+
+
+@dataclass
+class Duplicate:
+    kind: str  # "name", "repo" or "id"
+    key: str
+    refs: list[ProjectRef]
+
+    def __str__(self) -> str:
+        where = ", ".join(f"{r.section}[{r.index}]" for r in self.refs)
+        return f"{self.kind} {self.key!r} used by {where}"
+
+
+class DuplicateProjectError(ValueError):
+    def __init__(self, duplicates: list[Duplicate]) -> None:
+        super().__init__("duplicate projects: " + "; ".join(str(d) for d in duplicates))
+        self.duplicates = duplicates
+
+
+@dataclass
+class ProjectModel:
+    version: str = ""
+    by_name: dict[str, ProjectRef] = field(default_factory=dict)
+    by_repo: dict[str, ProjectRef] = field(default_factory=dict)
+    by_id: dict[str, ProjectRef] = field(default_factory=dict)
+    duplicates: list[Duplicate] = field(default_factory=list)
+
+    def get(self, key: str) -> ProjectRef | None:
+        """Look up by product id, then by name, then by repo URL or owner/name slug."""
+        ref = self.by_id.get(key) or self.by_name.get(key.strip().lower())
+        if ref is None:
+            rk = repo_key(key)
+            ref = self.by_repo.get(rk) if rk else None
+        return ref
+
+
+def _sync_order(ref: ProjectRef) -> tuple[bool, int, int]:
+    """Sort key under which the row the sync keeps for a product id comes last."""
+    rank = SECTIONS.index(ref.section) if ref.section in SECTIONS else -1
+    return bool(ref.row.get("sync-with-db")), rank, ref.index
+
+
+def build(document: dict[str, Any], version: str = "", strict: bool = False) -> ProjectModel:
+    model = ProjectModel(version=version)
+    clashes: dict[tuple[str, str], list[ProjectRef]] = {}
+
+    def _add(index: dict[str, ProjectRef], kind: str, key: str | None, ref: ProjectRef) -> None:
+        if not key:
+            return
+        first = index.setdefault(key, ref)
+        if first is not ref:
+            clashes.setdefault((kind, key), [first]).append(ref)
+
+    for section, rows in projects_cache.filter_sections(document).items():
+        for i, row in enumerate(rows):
+            ref = ProjectRef(section, i, row)
+            _add(model.by_name, "name", str(row.get("name") or "").strip().lower(), ref)
+            _add(model.by_repo, "repo", repo_key(row.get("repo")), ref)
+            # Only rows that carry or sync to a product id can collide in the products table
+            if row.get("sync-with-db") or (row.get("db-attribute") or {}).get("id"):
+                _add(model.by_id, "id", product_id(row), ref)
+
+    for (kind, key), refs in clashes.items():
+        if kind == "id":
+            model.by_id[key] = max(refs, key=_sync_order)
+
+    model.duplicates = [Duplicate(kind, key, refs) for (kind, key), refs in clashes.items()]
+    if strict and model.duplicates:
+        raise DuplicateProjectError(model.duplicates)
+    return model
+
+
+_lock = threading.Lock()
+_models: dict[Path, ProjectModel] = {}
+
+
+def for_snapshot(snap: projects_cache.Snapshot) -> ProjectModel:
+    """The model for a cached snapshot, rebuilt only when its version changes."""
+    with _lock:
+        model = _models.get(snap.path)
+    if model is None or model.version != snap.version:
+        model = build(snap.document, snap.version)
+        for duplicate in model.duplicates:
+            print(f"Warning: {snap.path.name}: duplicate {duplicate}")
+        with _lock:
+            _models[snap.path] = model
+    return model
+
+
+def main() -> None:
+    path = Path(sys.argv[1]) if len(sys.argv) > 1 else Path(__file__).parent / "projects.json"
+    snap = projects_cache.load(path)
+    model = build(snap.document, snap.version)
+    print(f"{len(model.by_name)} names, {len(model.by_repo)} repos, {len(model.by_id)} product ids")
+    for duplicate in model.duplicates:
+        print(f"  duplicate {duplicate}")
+    if model.duplicates:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """A parsed projects.json at one version.
+
+    ``document`` and ``sections`` are shared by every caller in the process and
+    must be treated as read-only; build a new dict to change anything.
+    """
+
+    path: Path
+    version: str  # sha256 of the file bytes
+    blob_sha: str  # git blob sha of the file bytes, as GitHub reports it
+    stat_key: tuple[int, int]  # (mtime_ns, size) used to detect on-disk changes
+    document: dict[str, Any]
+    sections: dict[str, list[dict[str, Any]]]
+
+
+_lock = threading.Lock()
+_snapshots: dict[Path, Snapshot] = {}
+
+
+def filter_sections(document: dict[str, Any]) -> dict[str, list[dict[str, Any]]]:
+    """Return only list-of-dict sections, which is what the editors can render."""
+    filtered: dict[str, list[dict[str, Any]]] = {}
+    for k, v in (document or {}).items():
+        if isinstance(v, list) and all(isinstance(r, dict) for r in v):
+            filtered[k] = v
+    return filtered
+
+
+def _stat_key(path: Path) -> tuple[int, int]:
+    st = path.stat()
+    return st.st_mtime_ns, st.st_size
+
+
+def _snapshot(path: Path, raw: bytes, stat_key: tuple[int, int]) -> Snapshot:
+    document = json.loads(raw)
+    snap = Snapshot(
+        path=path,
+        version=hashlib.sha256(raw).hexdigest(),
+        blob_sha=hashlib.sha1(b"blob %d\0" % len(raw) + raw).hexdigest(),
+        stat_key=stat_key,
+        document=document,
+        sections=filter_sections(document),
+    )
+    with _lock:
+        _snapshots[path] = snap
+    return snap
+
+
+def load(path: Path) -> Snapshot:
+    """Return the parsed document at ``path``, re-reading only when the file changed.
+
+    Raises the same errors as reading and parsing the file directly.
+    """
+    path = Path(path)
+    key = _stat_key(path)
+    with _lock:
+        snap = _snapshots.get(path)
+    if snap is not None and snap.stat_key == key:
+        return snap
+    return _snapshot(path, path.read_bytes(), key)
+
+
+def write_atomic(path: Path, content: bytes) -> None:
+    """Replace ``path`` with ``content`` so readers never see a partial file.
+
+    The temporary name carries the pid and thread id, so concurrent writers of
+    the same file never share one. Parent directories are created as needed.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        tmp.write_bytes(content)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def store(path: Path, document: dict[str, Any], content: bytes | None = None) -> Snapshot:
+    """Atomically write ``document`` to ``path`` and prime the cache with it."""
+    path = Path(path)
+    raw = content if content is not None else json.dumps(document, indent=2).encode("utf-8")
+    write_atomic(path, raw)
+    # Re-parse the written bytes so the cache never shares the caller's mutable dict
+    return _snapshot(path, raw, _stat_key(path))
+
+
+def invalidate(path: Path | None = None) -> None:
+    with _lock:
+        if path is None:
+            _snapshots.clear()
+        else:
+            _snapshots.pop(Path(path), None)
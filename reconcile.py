@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+from generate_readme import _clean_url
+
+# Diff a fetched GitHub repository list (repo-fetcher.py --json) against
+# projects.json and merge selected repos into a section. Every step is a dict
+# lookup per row or repo, so it stays linear for accounts with many repos.
+
+_GITHUB_PATH = re.compile(r"https?://(?:www\.)?github\.com/([^/\s?#]+)/([^/\s?#]+)", re.IGNORECASE)
+
+
+def repo_key(url: str | None) -> str | None:
+    """``owner/name`` (lower-cased) for anything that points at a GitHub repo."""
+    cleaned = _clean_url(url, for_repo=True)
+    m = _GITHUB_PATH.match(cleaned or "")
+    if not m:
+        return None
+    name = m.group(2)
+    if name.endswith(".git"):
+        name = name[:-4]
+    return f"{m.group(1)}/{name}".lower()
+
+
+def _site_key(url: str | None) -> str | None:
+    cleaned = _clean_url(url)
+    if not cleaned:
+        return None
+    return re.sub(r"^https?://(www\.)?", "", cleaned.lower()).rstrip("/")
+
+
+@dataclass
+class Entry:
+    section: str
+    index: int
+    row: dict[str, Any]
+
+
+@dataclass
+class Reconciliation:
+    new: list[dict[str, Any]] = field(default_factory=list)
+    # (existing entry, fetched repo it now lives at)
+    renamed: list[tuple[Entry, dict[str, Any]]] = field(default_factory=list)
+    archived: list[tuple[Entry, dict[str, Any]]] = field(default_factory=list)
+    removed: list[Entry] = field(default_factory=list)
+    matched: int = 0
+
+
+def index_projects(document: dict[str, Any]) -> dict[str, Entry]:
+    """Existing rows by normalized repo key; the first occurrence wins."""
+    index: dict[str, Entry] = {}
+    for section, rows in document.items():
+        if not isinstance(rows, list):
+            continue
+        for i, row in enumerate(rows):
+            if not isinstance(row, dict):
+                continue
+            key = repo_key(row.get("repo"))
+            if key and key not in index:
+                index[key] = Entry(section, i, row)
+    return index
+
+
+def diff(document: dict[str, Any], repos: Iterable[dict[str, Any]]) -> Reconciliation:
+    index = index_projects(document)
+    fetched = {repo_key(r.get("html_url") or r.get("url")): r for r in repos}
+    fetched.pop(None, None)
+    result = Reconciliation()
+
+    unmatched_repos: dict[str, dict[str, Any]] = {}
+    for key, repo in fetched.items():
+        entry = index.get(key)
+        if entry is None:
+            unmatched_repos[key] = repo
+            continue
+        result.matched += 1
+        if repo.get("archived"):
+            result.archived.append((entry, repo))
+
+    # Only rows under an owner we fetched can be judged missing
+    owners = {key.split("/", 1)[0] for key in fetched}
+    orphans = {key: e for key, e in index.items() if key not in fetched and key.split("/", 1)[0] in owners}
+
+    # A renamed or transferred repo keeps its name or its homepage; match orphans on either
+    by_name = {repo["name"].lower(): key for key, repo in unmatched_repos.items() if repo.get("name")}
+    by_site = {_site_key(repo.get("homepage")): key for key, repo in unmatched_repos.items() if repo.get("homepage")}
+    by_site.pop(None, None)
+    for key, entry in orphans.items():
+        candidate = by_site.get(_site_key(entry.row.get("deploy")) or "")
+        if candidate is None or candidate not in unmatched_repos:
+            candidate = by_name.get(str(entry.row.get("name") or "").lower())
+        if candidate is not None and candidate in unmatched_repos:
+            result.renamed.append((entry, unmatched_repos.pop(candidate)))
+        else:
+            result.removed.append(entry)
+
+    result.new = list(unmatched_repos.values())
+    return result
+
+
+def new_row(repo: dict[str, Any]) -> dict[str, Any]:
+    """A projects.json row for a fetched repo, shaped like the editor's normalize output."""
+    return {
+        "name": repo.get("name") or "",
+        "repo": repo.get("html_url") or repo.get("url"),
+        "visibility": (repo.get("visibility") or ("private" if repo.get("private") else "public")).lower(),
+        "deploy": (repo.get("homepage") or "").strip() or None,
+        "desc": (repo.get("description") or "").strip(),
+        "sync-with-db": False,
+    }
+
+
+def apply(
+    document: dict[str, Any],
+    result: Reconciliation,
+    section: str,
+    selected: set[str] | None = None,
+) -> tuple[dict[str, Any], int, int]:
+    """Return a new document with ``selected`` new repos appended to ``section``
+    and renamed entries pointed at their new URL.
+
+    ``selected`` holds repo names or full names; None means every new repo.
+    Archived and removed entries are only reported, never deleted.
+    Returns (document, rows added, rows updated). Raises ValueError when
+    ``section`` exists but is not a list of project rows.
+    """
+    current = document.get(section)
+    if current is not None and not (isinstance(current, list) and all(isinstance(r, dict) for r in current)):
+        raise ValueError(f"'{section}' is not a project section")
+
+    def wanted(repo: dict[str, Any]) -> bool:
+        if selected is None:
+            return True
+        return bool({str(repo.get("name")), str(repo.get("full_name"))} & selected)
+
+    merged = {k: (list(v) if isinstance(v, list) else v) for k, v in document.items()}
+    updated = 0
+    for entry, repo in result.renamed:
+        if not wanted(repo):
+            continue
+        row = dict(entry.row)
+        row["repo"] = repo.get("html_url") or row.get("repo")
+        if repo.get("visibility"):
+            row["visibility"] = repo["visibility"].lower()
+        merged[entry.section][entry.index] = row
+        updated += 1
+    additions = [new_row(repo) for repo in result.new if wanted(repo)]
+    merged[section] = list(merged.get(section) or []) + additions
+    return merged, len(additions), updated
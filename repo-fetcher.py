@@ -1,87 +1,252 @@
-import subprocess
+"""Fetch every repository of a GitHub account straight from the REST API.
+
+Pages are fetched in parallel once the first page says how many there are, and
+each page is cached on disk with its ETag so unchanged pages come back as 304
+(which GitHub does not count against the rate limit). ``--incremental`` only
+walks the most recently pushed repos until it reaches ones the cache already
+has, then merges them into the cached list. Archiving, renaming, visibility
+and description changes do not move ``pushed_at``, so an incremental run keeps
+the cached state of those repos; run without it before reconciling archived
+or renamed repos.
+
+Usage:
+    python repo-fetcher.py                      # your repos, one URL per line
+    python repo-fetcher.py --owner some-org --json
+    python repo-fetcher.py --incremental
+    python repo-fetcher.py --reconcile                      # diff against projects.json
+    python repo-fetcher.py --reconcile --apply --section dev_tools [--select a,b]
+
+Authentication: GITHUB_TOKEN, or the token of a logged-in GitHub CLI.
+"""
+import argparse
 import json
+import os
+import re
+import subprocess
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import requests
+
+import projects_cache
+
+API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com").rstrip("/")
+PER_PAGE = 100
+WORKERS = 8
+PROJECTS = Path(__file__).resolve().parent / "projects.json"
+CACHE_PATH = Path(os.getenv("REPO_FETCHER_CACHE", Path.home() / ".cache" / "repo-fetcher.json"))
+
+FIELDS = ("name", "full_name", "html_url", "description", "homepage", "visibility", "fork", "archived", "pushed_at")
+_LAST_PAGE = re.compile(r'[?&]page=(\d+)[^>]*>;\s*rel="last"')
+
 
-def check_gh_cli():
-    """Checks if the GitHub CLI is installed."""
+def get_token():
+    token = os.getenv("GITHUB_TOKEN", "").strip()
+    if token:
+        return token
     try:
-        # Run 'gh --version' and suppress its output.
-        subprocess.run(
-            "gh --version",
-            shell=True,
-            check=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
-        )
-        return True
+        # Fall back to the GitHub CLI's stored login, if there is one
+        result = subprocess.run(["gh", "auth", "token"], check=True, capture_output=True, text=True)
+        return result.stdout.strip()
     except (subprocess.CalledProcessError, FileNotFoundError):
-        print("Error: GitHub CLI ('gh') is not installed or not in your PATH.")
-        print("Please install it from: https://cli.github.com/")
-        return False
+        return ""
+
+
+def load_cache(path):
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {"pages": {}, "repos": {}}
+
+
+def save_cache(path, cache):
+    projects_cache.write_atomic(path, json.dumps(cache).encode("utf-8"))
+
+
+class Fetcher:
+    def __init__(self, token, cache):
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=WORKERS)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({"Accept": "application/vnd.github+json", "X-GitHub-Api-Version": "2022-11-28"})
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+        self.pages = cache.setdefault("pages", {})
+        self.not_modified = 0
+
+    def get_page(self, url, params):
+        """Return (repos, response headers) for one page, using the ETag cache."""
+        key = url + "?" + "&".join(f"{k}={v}" for k, v in sorted(params.items()))
+        cached = self.pages.get(key)
+        headers = {"If-None-Match": cached["etag"]} if cached else {}
+        r = self.session.get(url, params=params, headers=headers, timeout=30)
+        if r.status_code == 304 and cached:
+            self.not_modified += 1
+            return cached["body"], cached["headers"]
+        if r.status_code != 200:
+            try:
+                message = r.json().get("message", r.text)
+            except ValueError:
+                message = r.text
+            raise RuntimeError(f"GET {url} failed ({r.status_code}): {message}")
+        body = [{k: repo.get(k) for k in FIELDS} for repo in r.json()]
+        kept = {"Link": r.headers.get("Link", "")}
+        if r.headers.get("ETag"):
+            self.pages[key] = {"etag": r.headers["ETag"], "body": body, "headers": kept}
+        return body, kept
+
+    def fetch_all(self, url, params):
+        """Every page of ``url``: page 1 first for the page count, then the rest in parallel."""
+        first, headers = self.get_page(url, {**params, "page": 1})
+        m = _LAST_PAGE.search(headers.get("Link", ""))
+        last = int(m.group(1)) if m else 1
+        repos = list(first)
+        if last > 1:
+            with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+                pages = pool.map(lambda n: self.get_page(url, {**params, "page": n})[0], range(2, last + 1))
+                for page in pages:
+                    repos.extend(page)
+        return repos
+
+    def fetch_since(self, url, params, watermark):
+        """Pages in pushed order, stopping at the first repo not pushed after ``watermark``."""
+        repos = []
+        page = 1
+        while True:
+            body, headers = self.get_page(url, {**params, "page": page})
+            fresh = [r for r in body if (r.get("pushed_at") or "") > watermark]
+            repos.extend(fresh)
+            if len(fresh) < len(body) or not _LAST_PAGE.search(headers.get("Link", "")):
+                return repos
+            page += 1
+
+
+def endpoint(owner, kind):
+    if not owner:
+        # Everything the token's user owns, private repos included
+        return f"{API_URL}/user/repos", {"affiliation": "owner"}
+    if kind == "org":
+        return f"{API_URL}/orgs/{owner}/repos", {"type": "all"}
+    return f"{API_URL}/users/{owner}/repos", {"type": "owner"}
+
+
+def _describe(repo):
+    bits = [repo.get("visibility") or "?"]
+    if repo.get("homepage"):
+        bits.append(repo["homepage"])
+    return f"{repo.get('full_name') or repo.get('name')} ({', '.join(bits)})"
+
+
+def reconcile(repos, args):
+    """Print how ``repos`` differ from projects.json and, with --apply, merge them in one write."""
+    import reconcile as rc
+
+    document = projects_cache.load(args.projects).document
+    result = rc.diff(document, repos)
+    if args.no_archived:
+        # Only keeps archived repos out of the new rows; listed ones still report as archived
+        result.new = [r for r in result.new if not r.get("archived")]
+    print(f"{result.matched} already listed, {len(result.new)} new, {len(result.renamed)} renamed, "
+          f"{len(result.archived)} archived, {len(result.removed)} removed")
+    for repo in result.new:
+        print(f"  new       {_describe(repo)}")
+    for entry, repo in result.renamed:
+        print(f"  renamed   {entry.section}/{entry.row.get('name')}: {entry.row.get('repo')} -> {_describe(repo)}")
+    for entry, repo in result.archived:
+        print(f"  archived  {entry.section}/{entry.row.get('name')}: {_describe(repo)}")
+    for entry in result.removed:
+        print(f"  removed   {entry.section}/{entry.row.get('name')}: {entry.row.get('repo')}")
+
+    if not args.apply:
+        return
+    if not args.section:
+        print("Error: --apply needs --section to add new repos to.", file=sys.stderr)
+        sys.exit(1)
+    selected = {s.strip() for s in args.select.split(",") if s.strip()} if args.select else None
+    try:
+        merged, added, updated = rc.apply(document, result, args.section, selected)
+    except ValueError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        sys.exit(1)
+    if not added and not updated:
+        print("Nothing to merge.")
+        return
+    projects_cache.store(args.projects, merged)
+    print(f"Added {added} and updated {updated} rows in {args.projects}.")
+
 
 def main():
-    """
-    Main function to authenticate with GitHub CLI and fetch all repository URLs.
-    """
-    if not check_gh_cli():
+    parser = argparse.ArgumentParser(description="List all repositories of a GitHub account")
+    parser.add_argument("--owner", help="user or organization (default: the authenticated user)")
+    parser.add_argument("--org", action="store_true", help="treat --owner as an organization")
+    parser.add_argument("--incremental", action="store_true", help="only fetch repos pushed since the last run; archive, rename, visibility and "
+                        "description changes to other repos are not picked up")
+    parser.add_argument("--json", action="store_true", help="print repository details as JSON instead of URLs")
+    parser.add_argument("--cache", type=Path, default=CACHE_PATH, help=f"ETag cache file (default: {CACHE_PATH})")
+    parser.add_argument("--no-archived", action="store_true", help="skip archived repositories (with --reconcile: only as new rows)")
+    parser.add_argument("--reconcile", action="store_true", help="diff the repos against projects.json")
+    parser.add_argument("--projects", type=Path, default=PROJECTS, help="projects.json to reconcile against")
+    parser.add_argument("--from-json", type=Path, help="reconcile a saved --json listing instead of fetching")
+    parser.add_argument("--apply", action="store_true", help="with --reconcile: write the merge to projects.json")
+    parser.add_argument("--section", help="section new repos are added to, e.g. dev_tools")
+    parser.add_argument("--select", help="comma-separated repo names to merge (default: all new and renamed)")
+    args = parser.parse_args()
+
+    if args.from_json:
+        reconcile(json.loads(args.from_json.read_text(encoding="utf-8")), args)
+        return
+
+    token = get_token()
+    if not token and not args.owner:
+        print("Error: set GITHUB_TOKEN or log in with 'gh auth login' to list your own repositories.", file=sys.stderr)
         sys.exit(1)
 
-    print("Step 1: Checking GitHub CLI authentication status...")
-    try:
-        # First, check if we are already logged in to avoid unnecessary browser popups.
-        subprocess.run(
-            "gh auth status",
-            shell=True,
-            check=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE
-        )
-        print("✅ Already logged in.")
-    except subprocess.CalledProcessError:
-        print("-> You are not logged in. Please follow the prompts to authenticate.")
-        print("-> Your browser may open for you to complete the login process.")
-        # The 'gh auth login' command is interactive. We run it and let the user
-        # interact with it directly in their terminal.
-        # We don't capture output here because it's an interactive process.
-        auth_process = subprocess.run("gh auth login", shell=True)
-        if auth_process.returncode != 0:
-            print("\n❌ Authentication failed. Please try running the script again.")
-            sys.exit(1)
-        print("\n✅ Authentication successful!")
-
-
-    print("\nStep 2: Fetching all your repository links...")
+    cache = load_cache(args.cache)
+    fetcher = Fetcher(token, cache)
+    url, params = endpoint(args.owner, "org" if args.org else "user")
+    params.update({"per_page": PER_PAGE, "sort": "pushed", "direction": "desc"})
+    scope = args.owner or "@me"
+    known = cache.setdefault("repos", {}).get(scope)
+
+    started = time.perf_counter()
     try:
-        # Fetch all repos (up to 1000) in JSON format, getting only the name and URL.
-        # The 'gh' command is run, and its output is captured.
-        result = subprocess.run(
-            'gh repo list --limit 1000 --json name,url',
-            shell=True,
-            check=True,        # This will raise an exception if the command fails
-            capture_output=True, # Capture stdout and stderr
-            text=True          # Decode stdout/stderr as text
-        )
-
-        # The output from the command is a JSON string, so we parse it.
-        repos = json.loads(result.stdout)
-
-        if not repos:
-            print("No repositories found for your account.")
-            return
-
-        print(f"\n✅ Success! Found {len(repos)} repositories. Here are the links:\n")
-
-        # Print each repository URL on a new line.
-        for repo in repos:
-            print(repo['url'])
-
-    except subprocess.CalledProcessError as e:
-        print("\n❌ An error occurred while fetching repositories.")
-        print(f"Error details: {e.stderr}")
-    except json.JSONDecodeError:
-        print("\n❌ Could not parse the repository list from the GitHub CLI.")
-    except Exception as e:
-        print(f"\nAn unexpected error occurred: {e}")
+        if args.incremental and known:
+            watermark = max((r.get("pushed_at") or "" for r in known), default="")
+            fresh = fetcher.fetch_since(url, params, watermark)
+            by_name = {r["full_name"]: r for r in known}
+            by_name.update({r["full_name"]: r for r in fresh})
+            repos = sorted(by_name.values(), key=lambda r: r.get("pushed_at") or "", reverse=True)
+        else:
+            repos = fetcher.fetch_all(url, params)
+    except (requests.RequestException, RuntimeError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        sys.exit(1)
+    elapsed = time.perf_counter() - started
+
+    cache["repos"][scope] = repos
+    save_cache(args.cache, cache)
+
+    if args.reconcile:
+        if args.incremental and known:
+            print("Warning: --incremental keeps cached metadata for repos not pushed since the last run; "
+                  "archived or renamed ones may be missed.", file=sys.stderr)
+        # Reconcile sees archived repos too, or listed ones would read as removed
+        reconcile(repos, args)
+    else:
+        listed = [r for r in repos if not r.get("archived")] if args.no_archived else repos
+        if args.json:
+            print(json.dumps(listed, indent=2))
+        else:
+            for repo in listed:
+                print(repo["html_url"])
+    print(
+        f"{len(repos)} repositories in {elapsed:.1f}s ({fetcher.not_modified} pages unchanged)",
+        file=sys.stderr,
+    )
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from typing import Any
+
+# Three-way merge of projects.json documents at row granularity.
+#
+# Rows are matched by (section, name), so two editors changing different
+# projects both keep their edits. A row changed differently on both sides, or
+# changed on one side and removed on the other, is a conflict.
+
+Document = dict[str, Any]
+_MISSING = object()
+
+
+class MergeConflict(ValueError):
+    """Both sides changed the same rows; ``conflicts`` lists them."""
+
+    def __init__(self, conflicts: list[str]) -> None:
+        super().__init__("conflicting edits to " + ", ".join(conflicts))
+        self.conflicts = conflicts
+
+
+def _is_rows(value: Any) -> bool:
+    return isinstance(value, list) and all(isinstance(r, dict) for r in value)
+
+
+def _keyed(rows: list[dict[str, Any]]) -> dict[tuple[str, int], dict[str, Any]]:
+    # Duplicate names are told apart by occurrence so none of them is lost
+    keyed: dict[tuple[str, int], dict[str, Any]] = {}
+    seen: dict[str, int] = {}
+    for row in rows:
+        name = str(row.get("name") or "")
+        n = seen.get(name, 0)
+        seen[name] = n + 1
+        keyed[(name, n)] = row
+    return keyed
+
+
+def _pick(base: Any, theirs: Any, ours: Any) -> Any:
+    """Three-way pick of one value; raises LookupError when both sides diverge."""
+    if ours == theirs or theirs == base:
+        return ours
+    if ours == base:
+        return theirs
+    raise LookupError
+
+
+def merge_rows(section: str, base: list[dict[str, Any]], theirs: list[dict[str, Any]], ours: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    b, t, o = _keyed(base), _keyed(theirs), _keyed(ours)
+    merged: dict[tuple[str, int], Any] = {}
+    conflicts: list[str] = []
+    for key in {**b, **t, **o}:
+        try:
+            merged[key] = _pick(b.get(key, _MISSING), t.get(key, _MISSING), o.get(key, _MISSING))
+        except LookupError:
+            conflicts.append(f"{section}/{key[0] or '<unnamed>'}")
+    if conflicts:
+        raise MergeConflict(sorted(conflicts))
+
+    # Keep our row order unless they reordered the section; rows only the other
+    # side has go after their predecessor from that side's order.
+    primary, secondary = (o, t) if list(t) == list(b) else (t, o)
+    order = [k for k in primary if merged.get(k, _MISSING) is not _MISSING]
+    placed = set(order)
+    prev = None
+    for key in secondary:
+        if key not in placed and merged.get(key, _MISSING) is not _MISSING:
+            order.insert(order.index(prev) + 1 if prev is not None else 0, key)
+            placed.add(key)
+        if key in placed:
+            prev = key
+    return [merged[k] for k in order]
+
+
+def merge_documents(base: Document, theirs: Document, ours: Document) -> Document:
+    """Merge ``ours`` onto ``theirs``, both edited from ``base``.
+
+    Row sections merge row by row; any other key merges as a whole value.
+    Raises MergeConflict listing every row or key both sides changed.
+    """
+    merged: Document = {}
+    conflicts: list[str] = []
+    for key in {**base, **theirs, **ours}:
+        b, t, o = base.get(key, _MISSING), theirs.get(key, _MISSING), ours.get(key, _MISSING)
+        if all(v is _MISSING or _is_rows(v) for v in (b, t, o)):
+            try:
+                rows = merge_rows(key, *([] if v is _MISSING else v for v in (b, t, o)))
+            except MergeConflict as exc:
+                conflicts.extend(exc.conflicts)
+                continue
+            # A section one side deleted outright stays deleted when nothing remains
+            if rows or (t is not _MISSING and o is not _MISSING):
+                merged[key] = rows
+            continue
+        try:
+            value = _pick(b, t, o)
+        except LookupError:
+            conflicts.append(key)
+            continue
+        if value is not _MISSING:
+            merged[key] = value
+    if conflicts:
+        raise MergeConflict(conflicts)
+    # Key order follows ours, then anything only they added
+    return {k: merged[k] for k in [*ours, *(k for k in theirs if k not in ours)] if k in merged}
@@ -0,0 +1,213 @@
+"""Per-request stage timings, appended as JSON lines to LATENCY_LOG.
+
+Wrap a unit of work in ``with stage("github_put"):`` and, when a request is being
+recorded (``install(app)`` on a Flask app), its duration lands in that request's
+log line. Outside a recorded request ``stage`` does nothing, so library code such
+as sync_neon_db can be instrumented unconditionally.
+
+Summarize the log with ``python stage_log.py [path] [--endpoint NAME]``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextvars
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+# The repo's own requests.jsonl is read-only on Vercel, so log under /tmp by default
+LATENCY_LOG = Path(os.getenv("LATENCY_LOG", "/tmp/requests.jsonl"))
+LATENCY_LOG_MAX_BYTES = int(os.getenv("LATENCY_LOG_MAX_BYTES", str(5 * 1024 * 1024)))
+LATENCY_LOG_BACKUPS = int(os.getenv("LATENCY_LOG_BACKUPS", "3"))
+
+
+class Recorder:
+    """Stage durations (ms) for one request; stages may report from several threads."""
+
+    def __init__(self, endpoint: str, method: str) -> None:
+        self.endpoint = endpoint
+        self.method = method
+        self.started = time.perf_counter()
+        self.stages: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, ms: float) -> None:
+        with self._lock:
+            # Repeated stages (e.g. several GitHub GETs) accumulate
+            self.stages[name] = self.stages.get(name, 0.0) + ms
+
+    def record(self, status: int) -> dict[str, Any]:
+        with self._lock:
+            stages = {k: round(v, 2) for k, v in self.stages.items()}
+        return {
+            "ts": time.time(),
+            "endpoint": self.endpoint,
+            "method": self.method,
+            "status": status,
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 2),
+            "stages": stages,
+        }
+
+
+_current: contextvars.ContextVar[Recorder | None] = contextvars.ContextVar("stage_recorder", default=None)
+_write_lock = threading.Lock()
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    recorder = _current.get()
+    if recorder is None:
+        yield
+        return
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        recorder.add(name, (time.perf_counter() - t0) * 1000)
+
+
+def begin(endpoint: str, method: str) -> contextvars.Token:
+    return _current.set(Recorder(endpoint, method))
+
+
+def finish(token: contextvars.Token, status: int) -> dict[str, Any] | None:
+    recorder = _current.get()
+    _current.reset(token)
+    if recorder is None:
+        return None
+    return recorder.record(status)
+
+
+def _rotate(path: Path) -> None:
+    if LATENCY_LOG_BACKUPS <= 0:
+        path.unlink(missing_ok=True)
+        return
+    for i in range(LATENCY_LOG_BACKUPS - 1, 0, -1):
+        src = path.with_name(f"{path.name}.{i}")
+        if src.exists():
+            os.replace(src, path.with_name(f"{path.name}.{i + 1}"))
+    os.replace(path, path.with_name(f"{path.name}.1"))
+
+
+def write(record: dict[str, Any], path: Path | None = None) -> None:
+    path = path or LATENCY_LOG
+    line = json.dumps(record, separators=(",", ":")) + "\n"
+    with _write_lock:
+        try:
+            if path.exists() and path.stat().st_size + len(line) > LATENCY_LOG_MAX_BYTES:
+                _rotate(path)
+            with path.open("a", encoding="utf-8") as fh:
+                fh.write(line)
+        except OSError:
+            # Logging must never fail a request
+            pass
+
+
+def install(app: Any) -> None:
+    """Record every request served by a Flask ``app`` to LATENCY_LOG."""
+    from flask import g, request
+
+    @app.before_request
+    def _stage_log_begin():
+        g._stage_log_token = begin(request.url_rule.rule if request.url_rule else request.path, request.method)
+
+    @app.after_request
+    def _stage_log_status(response):
+        g._stage_log_status = response.status_code
+        return response
+
+    # Teardown also runs when the view raised, so failing requests are logged
+    # and the recorder is always reset
+    @app.teardown_request
+    def _stage_log_finish(exc):
+        token = g.pop("_stage_log_token", None)
+        status = g.pop("_stage_log_status", 500 if exc is not None else 200)
+        if token is None:
+            return
+        record = finish(token, status)
+        if record is not None:
+            if exc is not None:
+                record["error"] = type(exc).__name__
+            write(record)
+
+
+# --- summarizer -------------------------------------------------------------
+
+def _percentile(values: list[float], pct: float) -> float:
+    # Nearest-rank percentile; values must be sorted
+    if not values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(values)))
+    return values[min(rank, len(values)) - 1]
+
+
+def read_records(path: Path, include_rotated: bool = False) -> Iterator[dict[str, Any]]:
+    paths = [path]
+    if include_rotated:
+        paths = [path.with_name(f"{path.name}.{i}") for i in range(LATENCY_LOG_BACKUPS, 0, -1)] + paths
+    for p in paths:
+        try:
+            fh = p.open(encoding="utf-8")
+        except OSError:
+            continue
+        with fh:
+            for line in fh:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(record, dict) and "endpoint" in record:
+                    yield record
+
+
+def summarize(records: Iterator[dict[str, Any]], endpoint: str | None = None) -> dict[str, dict[str, list[float]]]:
+    """Group durations as {"METHOD endpoint": {"total": [...], stage: [...]}}, sorted."""
+    grouped: dict[str, dict[str, list[float]]] = {}
+    for record in records:
+        if endpoint and record.get("endpoint") != endpoint:
+            continue
+        key = f"{record.get('method', '')} {record.get('endpoint')}".strip()
+        bucket = grouped.setdefault(key, {"total": []})
+        bucket["total"].append(float(record.get("total_ms", 0.0)))
+        for name, ms in (record.get("stages") or {}).items():
+            bucket.setdefault(name, []).append(float(ms))
+    for bucket in grouped.values():
+        for values in bucket.values():
+            values.sort()
+    return grouped
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Print p50/p95/p99 per endpoint and stage from the latency log.")
+    parser.add_argument("path", nargs="?", type=Path, default=LATENCY_LOG)
+    parser.add_argument("--endpoint", help="only summarize this endpoint, e.g. /api/editor/save")
+    parser.add_argument("--all", action="store_true", help="include rotated log files")
+    args = parser.parse_args()
+
+    grouped = summarize(read_records(args.path, args.all), args.endpoint)
+    if not grouped:
+        print(f"No records in {args.path}")
+        return
+    header = f"{'stage':<24}{'count':>8}{'p50 ms':>12}{'p95 ms':>12}{'p99 ms':>12}"
+    for key in sorted(grouped):
+        bucket = grouped[key]
+        print(f"\n{key}")
+        print(header)
+        # total first, then stages by descending p95 so the slow ones stand out
+        names = ["total"] + sorted((n for n in bucket if n != "total"), key=lambda n: -_percentile(bucket[n], 95))
+        for name in names:
+            values = bucket[name]
+            print(
+                f"{name:<24}{len(values):>8}"
+                f"{_percentile(values, 50):>12.1f}{_percentile(values, 95):>12.1f}{_percentile(values, 99):>12.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
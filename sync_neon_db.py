@@ -1,11 +1,19 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import os
 import re
-from datetime import datetime, timezone
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any, Iterable, Iterator
+
+import projects_cache
+from stage_log import stage
 
 ROOT = Path(__file__).parent
 PROJECTS = ROOT / "projects.json"
@@ -13,6 +21,32 @@ JSON_MIRROR = ROOT / "db_products.json"
 
 DEFAULT_TABLE_NAME = os.getenv("NEON_TABLE", "products")
 
+# Pool sizing for the warm-container connection pool (see _get_pool)
+POOL_MAX_SIZE = int(os.getenv("NEON_POOL_MAX_SIZE", "4"))
+POOL_MAX_IDLE = float(os.getenv("NEON_POOL_MAX_IDLE", "240"))
+# Seconds to wait for a pooled connection before giving up (fail fast when Neon is down)
+POOL_TIMEOUT = float(os.getenv("NEON_POOL_TIMEOUT", "10"))
+
+# Pull mode (products table -> projects.json): rows per keyset page, and where
+# the updated_at watermark of the last pull is kept
+PULL_PAGE_SIZE = int(os.getenv("NEON_PULL_PAGE_SIZE", "500"))
+PULL_STATE = Path(os.getenv("NEON_PULL_STATE", Path.home() / ".cache" / "neon-pull.json"))
+# Seconds before the watermark that every pull re-reads. A row is stamped before its
+# transaction commits, so one still in flight during a pull can commit behind the mark.
+PULL_OVERLAP = float(os.getenv("NEON_PULL_OVERLAP", "300"))
+
+_POOLS: dict[str, Any] = {}
+_POOL_LOCK = threading.Lock()
+# (dsn, table) pairs whose DDL already ran in this process
+_SCHEMA_READY: set[tuple[str, str]] = set()
+
+# Sections whose rows can sync to the products table
+SECTIONS = ("saas_completed", "saas_in_progress", "dev_tools", "fun_projects")
+
+# Columns that make up a product's content; timestamps are bookkeeping and
+# deliberately excluded so an unchanged project hashes the same on every sync.
+CONTENT_FIELDS = ("id", "title", "year", "description", "image", "preview_image", "url", "category")
+
 
 def _slugify(value: str) -> str:
     value = value.strip().lower()
@@ -31,24 +65,29 @@ def _format_ts(dt: datetime) -> str:
 
 
 def _collect_projects(d: dict[str, Any]) -> list[dict[str, Any]]:
-    sections: list[str] = [
-        "saas_completed",
-        "saas_in_progress",
-        "dev_tools",
-        "fun_projects",
-    ]
     rows: list[dict[str, Any]] = []
-    for key in sections:
+    for key in SECTIONS:
         part = d.get(key) or []
         if isinstance(part, list):
             rows.extend([r for r in part if isinstance(r, dict)])
     return rows
 
 
+def _row_title(row: dict[str, Any]) -> str:
+    db = row.get("db-attribute") or {}
+    return (db.get("title") or row.get("title") or row.get("name") or "").strip()
+
+
+def product_id(row: dict[str, Any]) -> str:
+    """The products table id a project row syncs to."""
+    db = row.get("db-attribute") or {}
+    return db.get("id") or row.get("id") or f"product-{_slugify(_row_title(row))[:64]}"
+
+
 def _project_to_product(row: dict[str, Any]) -> dict[str, Any]:
     db = row.get("db-attribute") or {}
-    title_from_row = (db.get("title") or row.get("title") or row.get("name") or "").strip()
-    ident = (db.get("id") or row.get("id") or f"product-{_slugify(title_from_row)[:64]}")
+    title_from_row = _row_title(row)
+    ident = product_id(row)
     description = (db.get("description") or row.get("description") or row.get("desc") or "").strip() or None
     url = db.get("url") or row.get("url") or row.get("deploy") or row.get("repo") or None
     now = _now()
@@ -64,40 +103,120 @@ def _project_to_product(row: dict[str, Any]) -> dict[str, Any]:
         "created_at": now,
         "updated_at": now,
     }
+    product["content_hash"] = _content_hash(product)
     return product
 
 
+def _content_hash(product: dict[str, Any]) -> str:
+    payload = json.dumps([product.get(k) for k in CONTENT_FIELDS], ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _plan_sync(
+    records: Iterable[dict[str, Any]], remote: dict[str, str | None]
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]], list[str], list[str], int]:
+    """Diff local records against remote ``id -> content_hash``.
+
+    Returns (inserts, updates, deleted_ids, kept_ids, unchanged_count). Duplicate
+    ids keep the last record, matching what sequential upserts would leave behind.
+    Only rows a push wrote (non-null content_hash) are deleted when projects.json
+    no longer has them; rows created directly in the table are kept.
+    """
+    local: dict[str, dict[str, Any]] = {}
+    for r in records:
+        local[r["id"]] = r
+    inserts: list[dict[str, Any]] = []
+    updates: list[dict[str, Any]] = []
+    unchanged = 0
+    for ident, r in local.items():
+        if ident not in remote:
+            inserts.append(r)
+        elif remote[ident] != r.get("content_hash"):
+            updates.append(r)
+        else:
+            unchanged += 1
+    deleted: list[str] = []
+    kept: list[str] = []
+    for ident, digest in remote.items():
+        if ident not in local:
+            (kept if digest is None else deleted).append(ident)
+    return inserts, updates, deleted, kept, unchanged
+
+
 def _load_projects_file() -> dict[str, Any]:
     tmp = Path("/tmp/projects.json")
     if tmp.exists():
         try:
-            return json.loads(tmp.read_text(encoding="utf-8"))
+            return projects_cache.load(tmp).document
         except Exception:
             pass
-    return json.loads(PROJECTS.read_text(encoding="utf-8"))
+    return projects_cache.load(PROJECTS).document
 
 
-def _prepare_records() -> list[dict[str, Any]]:
-    data = _load_projects_file()
+def _prepare_records(data: dict[str, Any] | None = None) -> list[dict[str, Any]]:
+    if data is None:
+        data = _load_projects_file()
     items = _collect_projects(data)
-    products = []
+    products: dict[str, dict[str, Any]] = {}
+    names: dict[str, str] = {}
+    collisions: list[str] = []
     for it in items:
         if not it.get("sync-with-db"):
             continue
         product = _project_to_product(it)
-        products.append(product)
-    return products
+        name = str(it.get("name") or "")
+        if product["id"] in products:
+            collisions.append(f"{product['id']} ({names[product['id']]!r} and {name!r})")
+            # Keep the later row, which is what ON CONFLICT used to leave in the table
+            del products[product["id"]]
+        products[product["id"]] = product
+        names[product["id"]] = name
+    if collisions:
+        print("Warning: duplicate product ids, later rows win: " + ", ".join(collisions))
+    return list(products.values())
+
+
+def _load_json_mirror(raw: str | None = None) -> dict[str, dict[str, Any]]:
+    try:
+        if raw is None:
+            raw = JSON_MIRROR.read_text(encoding="utf-8")
+        rows = json.loads(raw)
+    except Exception:
+        return {}
+    return {r["id"]: r for r in rows if isinstance(r, dict) and r.get("id")}
 
 
-def _write_json_mirror(records: Iterable[dict[str, Any]]) -> None:
+def _mirror_rows(records: Iterable[dict[str, Any]], previous: dict[str, dict[str, Any]]) -> list[dict[str, Any]]:
     serializable: list[dict[str, Any]] = []
     for r in records:
+        prev = previous.get(r.get("id"))
+        if prev is not None:
+            # Keep the original creation time; only bump updated_at on content change
+            r = {**r, "created_at": prev.get("created_at") or r.get("created_at")}
+            if _content_hash(prev) == r.get("content_hash"):
+                r["updated_at"] = prev.get("updated_at") or r.get("updated_at")
         serializable.append({
             **r,
             "created_at": _format_ts(r["created_at"]) if isinstance(r.get("created_at"), datetime) else r.get("created_at"),
             "updated_at": _format_ts(r["updated_at"]) if isinstance(r.get("updated_at"), datetime) else r.get("updated_at"),
         })
-    JSON_MIRROR.write_text(json.dumps(serializable, ensure_ascii=False), encoding="utf-8")
+    return serializable
+
+
+def mirror_bytes(records: Iterable[dict[str, Any]], previous_raw: str | None = None) -> bytes:
+    """Serialize records in the db_products.json mirror format.
+
+    ``previous_raw`` is the current mirror content (defaults to the local file) and
+    supplies the original timestamps for rows that already exist.
+    """
+    rows = _mirror_rows(records, _load_json_mirror(previous_raw))
+    return json.dumps(rows, ensure_ascii=False).encode("utf-8")
+
+
+def _write_json_mirror(records: Iterable[dict[str, Any]]) -> None:
+    serializable = _mirror_rows(records, _load_json_mirror())
+    # Atomic so a concurrent `git add` never sees a half-written mirror
+    projects_cache.write_atomic(JSON_MIRROR, json.dumps(serializable, ensure_ascii=False).encode("utf-8"))
     print(f"Wrote {len(serializable)} rows to {JSON_MIRROR} (mirror mode)")
 
 
@@ -127,11 +246,72 @@ def _normalize_neon_dsn(raw: str) -> str:
     return s
 
 
-def _sync_neon(records: Iterable[dict[str, Any]], dsn: str, table: str) -> None:
-    # Import locally so the script can run in mirror mode without psycopg installed
-    import psycopg
+def _row_params(r: dict[str, Any]) -> tuple[Any, ...]:
+    return (
+        r.get("id"),
+        r.get("title"),
+        r.get("year"),
+        r.get("description"),
+        r.get("image"),
+        r.get("preview_image"),
+        r.get("url"),
+        r.get("category"),
+        r.get("created_at"),
+        r.get("content_hash"),
+    )
 
-    create_sql = f"""
+
+def _report_rate(label: str, count: int, elapsed: float) -> None:
+    rate = count / elapsed if elapsed > 0 else float(count)
+    print(f"{label} in {elapsed:.2f}s ({rate:.0f} rows/s).")
+
+
+def _get_pool(dsn: str) -> Any:
+    """Return the process-wide connection pool for ``dsn``, creating it lazily.
+
+    The pool lives at module level so warm serverless invocations reuse open
+    connections instead of paying a TCP+TLS+auth handshake per save. Connections
+    are health-checked on checkout and replaced transparently when Neon has
+    dropped them (e.g. after compute auto-suspend).
+    """
+    # Import locally so the script can run in mirror mode without psycopg installed
+    from psycopg_pool import ConnectionPool
+
+    with _POOL_LOCK:
+        pool = _POOLS.get(dsn)
+        if pool is None:
+            pool = ConnectionPool(
+                dsn,
+                min_size=1,
+                max_size=max(1, POOL_MAX_SIZE),
+                max_idle=POOL_MAX_IDLE,
+                timeout=POOL_TIMEOUT,
+                # Prepare statements on first use; the sync reuses the same few queries
+                kwargs={"prepare_threshold": 0, "connect_timeout": max(1, int(POOL_TIMEOUT))},
+                check=ConnectionPool.check_connection,
+                open=False,
+                name="neon",
+            )
+            pool.open(wait=False)
+            _POOLS[dsn] = pool
+    return pool
+
+
+def close_pools() -> None:
+    with _POOL_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+        _SCHEMA_READY.clear()
+    for pool in pools:
+        pool.close()
+
+
+# Versioned DDL for the products table, applied in order and recorded in
+# SCHEMA_TABLE per table name. {table} is the table, {name} its unqualified name
+# for index and trigger names. Append new versions; never edit applied ones.
+SCHEMA_TABLE = "schema_migrations"
+MIGRATIONS: tuple[tuple[int, str, str], ...] = (
+    (1, "create table", """
     CREATE TABLE IF NOT EXISTS {table} (
         id TEXT PRIMARY KEY,
         title TEXT NOT NULL,
@@ -142,15 +322,164 @@ def _sync_neon(records: Iterable[dict[str, Any]], dsn: str, table: str) -> None:
         url TEXT,
         category TEXT,
         created_at TIMESTAMPTZ,
-        updated_at TIMESTAMPTZ
+        updated_at TIMESTAMPTZ,
+        content_hash TEXT
     );
+    ALTER TABLE {table} ADD COLUMN IF NOT EXISTS content_hash TEXT;
+    """),
+    (2, "index category, year and updated_at", """
+    CREATE INDEX IF NOT EXISTS {name}_category_idx ON {table} (category);
+    CREATE INDEX IF NOT EXISTS {name}_year_idx ON {table} (year);
+    -- (updated_at, id) is the keyset --pull pages through
+    CREATE INDEX IF NOT EXISTS {name}_updated_at_idx ON {table} (updated_at, id);
+    """),
+    (3, "full-text search over title and description", """
+    ALTER TABLE {table} ADD COLUMN IF NOT EXISTS search tsvector GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(description, '')), 'B')
+    ) STORED;
+    CREATE INDEX IF NOT EXISTS {name}_search_idx ON {table} USING GIN (search);
+    """),
+    (4, "bump updated_at on direct edits", """
+    CREATE OR REPLACE FUNCTION {name}_touch_updated_at() RETURNS trigger AS $$
+    BEGIN
+        IF NEW.updated_at IS NOT DISTINCT FROM OLD.updated_at THEN
+            -- The wall clock, not now() (transaction start), so long transactions do not stamp the past
+            NEW.updated_at := clock_timestamp();
+        END IF;
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql;
+    DROP TRIGGER IF EXISTS {name}_touch_updated_at ON {table};
+    CREATE TRIGGER {name}_touch_updated_at BEFORE UPDATE ON {table}
+        FOR EACH ROW EXECUTE FUNCTION {name}_touch_updated_at();
+    """),
+)
+
+
+def _schema_version(cur: Any, table: str) -> int:
+    cur.execute("SELECT to_regclass(%s) IS NOT NULL;", (SCHEMA_TABLE,))
+    if not cur.fetchone()[0]:
+        return 0
+    cur.execute(f"SELECT coalesce(max(version), 0) FROM {SCHEMA_TABLE} WHERE target = %s;", (table,))
+    return cur.fetchone()[0]
+
+
+def _ensure_schema(cur: Any, dsn: str, table: str) -> None:
+    """Apply pending MIGRATIONS to ``table``; an up-to-date table costs two SELECTs."""
+    if (dsn, table) in _SCHEMA_READY:
+        return
+    if _schema_version(cur, table) >= MIGRATIONS[-1][0]:
+        return
+    # Serialize concurrent cold starts; the lock is released when the transaction ends
+    cur.execute("SELECT pg_advisory_xact_lock(hashtext(%s));", (f"{SCHEMA_TABLE}:{table}",))
+    cur.execute(f"""
+    CREATE TABLE IF NOT EXISTS {SCHEMA_TABLE} (
+        target TEXT NOT NULL,
+        version INTEGER NOT NULL,
+        description TEXT,
+        applied_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+        PRIMARY KEY (target, version)
+    );
+    """, prepare=False)
+    current = _schema_version(cur, table)
+    name = table.rsplit(".", 1)[-1]
+    for version, description, ddl in MIGRATIONS:
+        if version <= current:
+            continue
+        # Multi-statement DDL cannot be a prepared statement
+        cur.execute(ddl.format(table=table, name=name), prepare=False)
+        cur.execute(
+            f"INSERT INTO {SCHEMA_TABLE} (target, version, description) VALUES (%s, %s, %s);",
+            (table, version, description),
+        )
+        print(f"Migrated table '{table}' to schema version {version}: {description}")
+
+
+@contextmanager
+def _cursor(dsn: str, table: str) -> Iterator[Any]:
+    """A cursor on a pooled connection, with ``table`` migrated to the latest schema."""
+    try:
+        with _get_pool(dsn).connection() as conn, conn.cursor() as cur:
+            _ensure_schema(cur, dsn, table)
+            yield cur
+    except Exception:
+        _SCHEMA_READY.discard((dsn, table))
+        raise
+    _SCHEMA_READY.add((dsn, table))
+
+
+class SchemaOutdatedError(RuntimeError):
+    """The table is behind MIGRATIONS; run ``python sync_neon_db.py --migrate`` or a sync."""
+
+
+def migrate(dsn: str, table: str) -> int:
+    """Bring ``table`` up to the latest schema and return its version."""
+    _SCHEMA_READY.discard((dsn, table))
+    with _cursor(dsn, table) as cur:
+        return _schema_version(cur, table)
+
+
+SEARCH_COLUMNS = ("id", "title", "year", "description", "image", "preview_image", "url", "category", "updated_at")
+
+
+def search_products(
+    dsn: str,
+    table: str,
+    q: str = "",
+    category: str | None = None,
+    year: str | None = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> list[dict[str, Any]]:
+    """Products matching ``q`` (web search syntax) and the filters, best match first.
+
+    Without ``q`` the most recently updated products come first. Matching uses
+    the GIN-indexed ``search`` column, and the filters the category/year indexes.
+
+    Never migrates: it serves public requests, and DDL such as the generated
+    search column rewrites the table under an exclusive lock. Raises
+    SchemaOutdatedError while the table is behind MIGRATIONS.
+    """
+    source, where, params = table, [], []
+    if q:
+        source += ", websearch_to_tsquery('english', %s) AS query"
+        params.append(q)
+        where.append("search @@ query")
+        order = "ts_rank(search, query) DESC, id"
+    else:
+        order = "updated_at DESC NULLS LAST, id"
+    if category:
+        where.append("category = %s")
+        params.append(category)
+    if year:
+        where.append("year = %s")
+        params.append(str(year))
+    search_sql = f"""
+    SELECT {", ".join(SEARCH_COLUMNS)} FROM {source}
+    {"WHERE " + " AND ".join(where) if where else ""}
+    ORDER BY {order}
+    LIMIT %s OFFSET %s;
     """
+    with _get_pool(dsn).connection() as conn, conn.cursor() as cur:
+        if (dsn, table) not in _SCHEMA_READY:
+            version = _schema_version(cur, table)
+            if version < MIGRATIONS[-1][0]:
+                raise SchemaOutdatedError(f"table '{table}' is at schema version {version}, need {MIGRATIONS[-1][0]}")
+            _SCHEMA_READY.add((dsn, table))
+        cur.execute(search_sql, (*params, limit, offset))
+        return [dict(zip(SEARCH_COLUMNS, r)) for r in cur.fetchall()]
+
 
+def _sync_neon(records: Iterable[dict[str, Any]], dsn: str, table: str) -> None:
+    # created_at is only written on insert, so existing rows keep their original value.
+    # updated_at comes from the database clock, the same one the direct-edit trigger
+    # uses, so --pull's watermark compares timestamps from a single clock.
     insert_sql = f"""
     INSERT INTO {table} (
-        id, title, year, description, image, preview_image, url, category, created_at, updated_at
+        id, title, year, description, image, preview_image, url, category, created_at, updated_at, content_hash
     ) VALUES (
-        %s,%s,%s,%s,%s,%s,%s,%s,%s,%s
+        %s,%s,%s,%s,%s,%s,%s,%s,%s,clock_timestamp(),%s
     )
     ON CONFLICT (id) DO UPDATE SET
         title = EXCLUDED.title,
@@ -160,39 +489,56 @@ def _sync_neon(records: Iterable[dict[str, Any]], dsn: str, table: str) -> None:
         preview_image = EXCLUDED.preview_image,
         url = EXCLUDED.url,
         category = EXCLUDED.category,
-        updated_at = EXCLUDED.updated_at;
+        updated_at = EXCLUDED.updated_at,
+        content_hash = EXCLUDED.content_hash;
     """
 
+    delete_sql = f"DELETE FROM {table} WHERE id = ANY(%s);"
+
     rows = list(records)
-    with psycopg.connect(dsn) as conn:
-        with conn.cursor() as cur:
-            cur.execute(create_sql)
-            for r in rows:
-                cur.execute(
-                    insert_sql,
-                    (
-                        r.get("id"),
-                        r.get("title"),
-                        r.get("year"),
-                        r.get("description"),
-                        r.get("image"),
-                        r.get("preview_image"),
-                        r.get("url"),
-                        r.get("category"),
-                        r.get("created_at"),
-                        r.get("updated_at"),
-                    ),
-                )
-    print(f"Upserted {len(rows)} rows into table '{table}'.")
-
-
-def sync_from_env(strict: bool = False) -> bool:
+    started = time.perf_counter()
+    try:
+        with ExitStack() as stack:
+            with stage("neon_connect"):
+                conn = stack.enter_context(_get_pool(dsn).connection())
+            with conn.cursor() as cur:
+                with stage("neon_schema"):
+                    _ensure_schema(cur, dsn, table)
+                with stage("neon_diff"):
+                    cur.execute(f"SELECT id, content_hash FROM {table};")
+                    remote = {ident: digest for ident, digest in cur.fetchall()}
+                    inserts, updates, deleted, kept, unchanged = _plan_sync(rows, remote)
+                changed = inserts + updates
+                # executemany runs in pipeline mode: all upserts go out in one batch
+                # instead of one network round trip per product.
+                with stage("neon_upsert"):
+                    if changed:
+                        cur.executemany(insert_sql, [_row_params(r) for r in changed])
+                    if deleted:
+                        cur.execute(delete_sql, (deleted,))
+    except Exception:
+        # The table may have been dropped or altered underneath us; re-run DDL next time
+        _SCHEMA_READY.discard((dsn, table))
+        raise
+    _SCHEMA_READY.add((dsn, table))
+    _report_rate(
+        f"Synced table '{table}': {len(inserts)} inserted, {len(updates)} updated, "
+        f"{len(deleted)} deleted, {unchanged} unchanged",
+        len(changed) + len(deleted),
+        time.perf_counter() - started,
+    )
+    if kept:
+        print("Rows created in the table with no synced project, kept: " + ", ".join(kept))
+
+
+def sync_from_env(strict: bool = False, data: dict[str, Any] | None = None) -> bool:
     """Sync using NEON_* env vars.
 
+    Syncs ``data`` if given, otherwise the current projects.json.
     Returns True if a DB sync was attempted (and succeeded), False if mirrored or skipped.
     In strict mode, exceptions are raised to the caller.
     """
-    records = _prepare_records()
+    records = _prepare_records(data)
     raw_dsn = os.getenv("NEON_DATABASE_URL", "").strip()
     dsn = _normalize_neon_dsn(raw_dsn)
     table = (os.getenv("NEON_TABLE") or DEFAULT_TABLE_NAME).strip()
@@ -213,14 +559,189 @@ def sync_from_env(strict: bool = False) -> bool:
         return False
 
 
+@dataclass
+class PullResult:
+    merged: list[str] = field(default_factory=list)
+    # Changed in the table and in projects.json since the last push; projects.json wins
+    conflicts: list[str] = field(default_factory=list)
+    # Rows with no synced project in projects.json. Pulls leave them alone; the
+    # next push keeps those created in the table and deletes those it wrote itself
+    unknown: list[str] = field(default_factory=list)
+    unchanged: int = 0
+
+
+def _norm(value: Any) -> str | None:
+    return None if value is None or value == "" else str(value)
+
+
+def _fetch_changed(dsn: str, table: str, after: tuple[datetime, str]) -> list[dict[str, Any]]:
+    """Rows with (updated_at, id) past ``after``, one keyset page at a time.
+
+    Rows without an updated_at are never returned. Direct UPDATEs bump it
+    through the trigger from schema version 4, so the next pull sees them.
+    """
+    columns = (*CONTENT_FIELDS, "updated_at", "content_hash")
+    select_sql = f"""
+    SELECT {", ".join(columns)} FROM {table}
+    WHERE (updated_at, id) > (%s, %s)
+    ORDER BY updated_at, id
+    LIMIT %s;
+    """
+    rows: list[dict[str, Any]] = []
+    with _cursor(dsn, table) as cur:
+        while True:
+            cur.execute(select_sql, (*after, PULL_PAGE_SIZE))
+            page = [dict(zip(columns, r)) for r in cur.fetchall()]
+            rows.extend(page)
+            if len(page) < PULL_PAGE_SIZE:
+                return rows
+            after = (page[-1]["updated_at"], page[-1]["id"])
+
+
+def merge_pulled(document: dict[str, Any], remote_rows: Iterable[dict[str, Any]]) -> tuple[dict[str, Any], PullResult]:
+    """Merge products table rows into the ``db-attribute`` blocks of ``document``.
+
+    The stored content_hash is what the last push wrote, so it tells which side
+    changed: a row edited only in the table is merged, one edited only in
+    projects.json is kept for the next push, and one edited on both sides is
+    reported as a conflict and kept as in projects.json. Returns a new document.
+    """
+    # Later rows win on a shared id, as in _prepare_records
+    located: dict[str, tuple[str, int]] = {}
+    for section in SECTIONS:
+        for i, row in enumerate(document.get(section) or []):
+            if isinstance(row, dict) and row.get("sync-with-db"):
+                located[product_id(row)] = (section, i)
+
+    merged = {k: (list(v) if isinstance(v, list) else v) for k, v in document.items()}
+    result = PullResult()
+    for remote in remote_rows:
+        ident = remote["id"]
+        if ident not in located:
+            result.unknown.append(ident)
+            continue
+        section, i = located[ident]
+        row = merged[section][i]
+        local = _project_to_product(row)
+        changed = [f for f in CONTENT_FIELDS if _norm(remote.get(f)) != _norm(local.get(f))]
+        if not changed:
+            result.unchanged += 1
+            continue
+        # Postgres returns year as text; compare using the local value wherever only the type differs
+        theirs = {f: (remote.get(f) if f in changed else local.get(f)) for f in CONTENT_FIELDS}
+        if remote.get("content_hash") == _content_hash(theirs):
+            result.unchanged += 1  # only projects.json changed; the next push sends it
+            continue
+        if remote.get("content_hash") not in (None, local["content_hash"]):
+            result.conflicts.append(ident)
+            continue
+        db = dict(row.get("db-attribute") or {})
+        # Pin the id: a pulled title change must not move the row to a new slug id
+        db["id"] = ident
+        for f in changed:
+            value = remote.get(f)
+            if isinstance(local.get(f), int) and isinstance(value, str) and value.isdigit():
+                value = int(value)
+            db[f] = value
+        merged[section][i] = {**row, "db-attribute": db}
+        result.merged.append(ident)
+    return merged, result
+
+
+def _pull_state_key(dsn: str, table: str) -> str:
+    # The DSN carries the password; key the state file by a digest of it
+    return hashlib.sha256(dsn.encode("utf-8")).hexdigest()[:16] + ":" + table
+
+
+def _load_watermark(dsn: str, table: str) -> tuple[datetime, str]:
+    try:
+        state = json.loads(PULL_STATE.read_text(encoding="utf-8"))
+        saved = state[_pull_state_key(dsn, table)]
+        return datetime.fromisoformat(saved["updated_at"]), saved["id"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return datetime.min.replace(tzinfo=timezone.utc), ""
+
+
+def _save_watermark(dsn: str, table: str, mark: tuple[datetime, str]) -> None:
+    try:
+        state = json.loads(PULL_STATE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        state = {}
+    state[_pull_state_key(dsn, table)] = {"updated_at": mark[0].isoformat(), "id": mark[1]}
+    projects_cache.write_atomic(PULL_STATE, json.dumps(state, indent=2).encode("utf-8"))
+
+
+def pull(dsn: str, table: str, path: Path = PROJECTS, full: bool = False, dry_run: bool = False) -> PullResult:
+    """Merge products table rows changed since the last pull into ``path``.
+
+    ``full`` ignores the stored watermark. Otherwise the pull starts PULL_OVERLAP
+    seconds before it; re-read rows merge as unchanged. A write transaction that
+    stays open longer than that can still commit rows behind the watermark, and
+    only a ``full`` pull sees them. projects.json is written at most once, and
+    the watermark only moves after that write succeeds.
+    """
+    mark = (datetime.min.replace(tzinfo=timezone.utc), "") if full else _load_watermark(dsn, table)
+    after = (mark[0] - timedelta(seconds=PULL_OVERLAP), "") if mark[1] else mark
+    started = time.perf_counter()
+    with stage("neon_pull"):
+        remote = _fetch_changed(dsn, table, after)
+    document = projects_cache.load(path).document
+    merged, result = merge_pulled(document, remote)
+    _report_rate(
+        f"Pulled {len(remote)} changed row(s) from '{table}': {len(result.merged)} merged, "
+        f"{len(result.conflicts)} conflicting, {len(result.unknown)} unknown, {result.unchanged} unchanged",
+        len(remote),
+        time.perf_counter() - started,
+    )
+    if result.conflicts:
+        print("Warning: changed on both sides, keeping projects.json: " + ", ".join(result.conflicts))
+    if result.unknown:
+        print("Rows with no synced project, skipped: " + ", ".join(result.unknown))
+    if dry_run:
+        return result
+    if result.merged:
+        projects_cache.store(path, merged)
+        print(f"Wrote {len(result.merged)} merged row(s) to {path}")
+    if remote:
+        _save_watermark(dsn, table, max(mark, (remote[-1]["updated_at"], remote[-1]["id"])))
+    return result
+
+
 def main() -> None:
     import argparse
 
     parser = argparse.ArgumentParser(description="Sync projects.json to Neon or mirror to JSON")
     parser.add_argument("--strict", action="store_true", help="Exit non-zero if DB sync fails instead of mirroring")
+    parser.add_argument("--pull", action="store_true", help="Merge rows edited in the table back into projects.json")
+    parser.add_argument("--full", action="store_true", help="With --pull: ignore the stored watermark")
+    parser.add_argument("--dry-run", action="store_true", help="With --pull: report without writing anything")
+    parser.add_argument("--projects", type=Path, default=PROJECTS, help="projects.json to pull into")
+    parser.add_argument("--migrate", action="store_true", help="Only apply pending schema migrations")
     args = parser.parse_args()
 
-    print(f"Prepared {len(_prepare_records())} record(s) for DB sync from projects.json")
+    if args.migrate:
+        dsn = _normalize_neon_dsn(os.getenv("NEON_DATABASE_URL", "").strip())
+        if not dsn:
+            raise SystemExit("NEON_DATABASE_URL not set")
+        table = os.getenv("NEON_TABLE", DEFAULT_TABLE_NAME)
+        try:
+            print(f"Table '{table}' is at schema version {migrate(dsn, table)}")
+        finally:
+            close_pools()
+        return
+
+    if args.pull:
+        dsn = _normalize_neon_dsn(os.getenv("NEON_DATABASE_URL", "").strip())
+        if not dsn:
+            raise SystemExit("NEON_DATABASE_URL not set")
+        try:
+            pull(dsn, os.getenv("NEON_TABLE", DEFAULT_TABLE_NAME), args.projects, args.full, args.dry_run)
+        finally:
+            close_pools()
+        return
+
+    records = _prepare_records()
+    print(f"Prepared {len(records)} record(s) for DB sync from projects.json")
 
     raw_dsn = os.getenv("NEON_DATABASE_URL", "").strip()
     dsn = _normalize_neon_dsn(raw_dsn)
@@ -232,13 +753,15 @@ def main() -> None:
         return
 
     try:
-        _sync_neon(_prepare_records(), dsn, os.getenv("NEON_TABLE", DEFAULT_TABLE_NAME))
+        _sync_neon(records, dsn, os.getenv("NEON_TABLE", DEFAULT_TABLE_NAME))
     except Exception as exc:  # pragma: no cover
         print(f"Error syncing Neon DB: {exc}")
         if args.strict:
             raise
         # Non-strict: no mirror fallback, just return non-zero via print
         print("Skipping mirror; strictness disabled.")
+    finally:
+        close_pools()
 
 
 if __name__ == "__main__":